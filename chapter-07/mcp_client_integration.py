@@ -13,10 +13,22 @@ Demonstrates MCP client-side integration concepts including:
 import asyncio
 import json
 import time
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
+from array import array
+from collections import deque
+from itertools import islice
+
+# Optional: uvloop's libuv-backed event loop cuts per-await overhead
+# substantially for asyncio-heavy workloads (pip install uvloop)
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
 
 # ============================================================================
@@ -30,8 +42,15 @@ class WorkflowStep:
     tool_name: str
     args: tuple
     id: str = field(default="")
+    # Ids of steps whose results this step needs; steps with disjoint
+    # dependencies can run concurrently
+    depends_on: tuple = field(default=())
     
     def __post_init__(self):
+        # Normalize args to an immutable tuple once so execution records
+        # never alias caller-owned lists and steps stay hashable
+        if not isinstance(self.args, tuple):
+            self.args = tuple(self.args)
         if not self.id:
             self.id = f"{self.server_id}_{self.tool_name}"
 
@@ -51,17 +70,63 @@ class TaskStatus(Enum):
     FAILED = "failed"
 
 
+# Compact integer codes for the columnar execution history
+_STATUS_CODE = {status: i for i, status in enumerate(TaskStatus)}
+_STATUS_BY_CODE = tuple(TaskStatus)
+
+
+async def _none_coro():
+    """Placeholder coroutine for steps whose server is not connected."""
+    return None
+
+
 # ============================================================================
 # Dummy Server Implementation (for demonstration)
 # ============================================================================
 
 class DummyServer:
-    """A simple server implementation exposing tools for demonstration."""
-    
-    def __init__(self, server_id: str, tools: Dict[str, Callable]):
+    """
+    A simple server implementation exposing tools for demonstration.
+
+    Accepts an optional shared transport session so that a remote
+    implementation (e.g. one backed by aiohttp or httpx) can reuse a
+    single pooled connection instead of opening one per call_tool.
+    """
+
+    def __init__(self, server_id: str, tools: Dict[str, Callable],
+                 session: Optional[Any] = None):
         self.server_id = server_id
         self.tools = tools
+        self.session = session
+        # Classify tools once at registration so the hot path never has
+        # to inspect the callable before dispatching
+        self._async_tools = {
+            name: func for name, func in tools.items()
+            if asyncio.iscoroutinefunction(func)
+        }
+        self._sync_tools = {
+            name: func for name, func in tools.items()
+            if name not in self._async_tools
+        }
         self.capabilities_cache: Optional[List[Dict[str, Any]]] = None
+
+    def has_sync_tool(self, tool_name: str) -> bool:
+        """True if the tool can be invoked without awaiting."""
+        return tool_name in self._sync_tools
+
+    def call_tool_sync(self, tool_name: str, *args) -> Any:
+        """
+        Invoke a synchronous tool directly - no coroutine allocation and
+        no event-loop scheduling round-trip.
+        """
+        func = self._sync_tools.get(tool_name)
+        if func is None:
+            raise ValueError(f"Unknown or async tool: {tool_name}")
+        return func(*args)
+
+    async def close(self):
+        """Release transport resources (no-op for the in-process server)."""
+        self.session = None
     
     async def discover_capabilities(self) -> List[Dict[str, Any]]:
         """
@@ -81,9 +146,12 @@ class DummyServer:
     
     async def call_tool(self, tool_name: str, *args) -> Any:
         """Dispatch to the appropriate tool function."""
-        if tool_name not in self.tools:
+        func = self._async_tools.get(tool_name)
+        if func is not None:
+            return await func(*args)
+        func = self._sync_tools.get(tool_name)
+        if func is None:
             raise ValueError(f"Unknown tool: {tool_name}")
-        func = self.tools[tool_name]
         return func(*args)
     
     async def list_resources(self) -> List[Dict[str, Any]]:
@@ -147,62 +215,104 @@ class WorkflowOrchestrator:
     Handles dependency management, adaptive workflows, and error recovery.
     """
     
+    # Keyword-matching rules as data: (keywords, server_id, tool_name,
+    # context key, default value, wrap the context value in a 1-tuple?)
+    _PLAN_RULES = (
+        (('sum', 'add'), 'math', 'add', 'numbers', (2, 3), False),
+        (('multiply', 'product'), 'math', 'multiply', 'numbers', (4, 5), False),
+        (('subtract', 'difference'), 'math', 'subtract', 'numbers', (10, 3), False),
+        (('divide', 'quotient'), 'math', 'divide', 'numbers', (20, 4), False),
+        (('uppercase', 'upper'), 'text', 'uppercase', 'text', 'hello world', True),
+        (('lowercase', 'lower'), 'text', 'lowercase', 'text', 'HELLO WORLD', True),
+        (('reverse',), 'text', 'reverse', 'text', 'hello', True),
+        (('length', 'count'), 'text', 'length', 'text', 'hello world', True),
+        (('fetch', 'retrieve', 'get data'), 'data', 'fetch', 'query', 'default', True),
+        (('analyze', 'analysis'), 'data', 'analyze', 'data', (1, 2, 3, 4, 5), True),
+    )
+
     def __init__(self):
-        self.execution_history: List[Dict[str, Any]] = []
-    
-    async def plan_workflow(self, goal: str, context: Dict[str, Any], 
+        # Column-oriented execution history: parallel arrays instead of
+        # a list of per-step dicts. Numeric columns use array.array, so a
+        # record costs ~80 bytes instead of ~600 and status/time scans
+        # touch packed memory rather than dict objects.
+        self.execution_history: Dict[str, Any] = {
+            "step_id": [],
+            "server_id": [],
+            "tool_name": [],
+            "status": array('b'),
+            "started_ns": array('q'),
+            "completed_ns": array('q'),
+            "error": [],
+        }
+
+    def history_len(self) -> int:
+        """Number of recorded step executions."""
+        return len(self.execution_history["step_id"])
+
+    def _record_execution(self, step_id: str, server_id: str,
+                          tool_name: str, status: TaskStatus,
+                          started_ns: int, completed_ns: int,
+                          error: Optional[str]):
+        history = self.execution_history
+        history["step_id"].append(step_id)
+        history["server_id"].append(server_id)
+        history["tool_name"].append(tool_name)
+        history["status"].append(_STATUS_CODE[status])
+        history["started_ns"].append(started_ns)
+        history["completed_ns"].append(completed_ns)
+        history["error"].append(error)
+
+    def as_records(self):
+        """Yield history rows as dicts for compatibility with dict-era callers."""
+        history = self.execution_history
+        for i in range(self.history_len()):
+            yield {
+                "step_id": history["step_id"][i],
+                "server_id": history["server_id"][i],
+                "tool_name": history["tool_name"][i],
+                "status": _STATUS_BY_CODE[history["status"][i]].value,
+                "started_ns": history["started_ns"][i],
+                "completed_ns": history["completed_ns"][i],
+                "error": history["error"][i],
+            }
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _plan_template(goal_lower: str,
+                       tools_key: frozenset) -> Tuple[tuple, ...]:
+        """
+        Match goal keywords against the planning rules and return the
+        step templates. Cached so repeated goals (demo loops, retries)
+        skip the keyword scan entirely; only per-call context
+        substitution remains in plan_workflow.
+        """
+        return tuple(
+            (server_id, tool_name, ctx_key, default, wrap_single)
+            for keywords, server_id, tool_name, ctx_key, default, wrap_single
+            in WorkflowOrchestrator._PLAN_RULES
+            if any(kw in goal_lower for kw in keywords)
+        )
+
+    async def plan_workflow(self, goal: str, context: Dict[str, Any],
                            available_tools: Dict[str, List[str]]) -> Workflow:
         """
         Parse a goal description and generate workflow steps.
         This is a simplified planner - in production, this would use
         more sophisticated NLP or AI-based planning.
         """
+        tools_key = frozenset(
+            (server_id, name)
+            for server_id, names in available_tools.items()
+            for name in names
+        )
+        template = self._plan_template(goal.lower(), tools_key)
+
         steps: List[WorkflowStep] = []
-        goal_lower = goal.lower()
-        
-        # Math operations
-        if 'sum' in goal_lower or 'add' in goal_lower:
-            numbers = context.get('numbers', (2, 3))
-            steps.append(WorkflowStep('math', 'add', numbers))
-        
-        if 'multiply' in goal_lower or 'product' in goal_lower:
-            numbers = context.get('numbers', (4, 5))
-            steps.append(WorkflowStep('math', 'multiply', numbers))
-        
-        if 'subtract' in goal_lower or 'difference' in goal_lower:
-            numbers = context.get('numbers', (10, 3))
-            steps.append(WorkflowStep('math', 'subtract', numbers))
-        
-        if 'divide' in goal_lower or 'quotient' in goal_lower:
-            numbers = context.get('numbers', (20, 4))
-            steps.append(WorkflowStep('math', 'divide', numbers))
-        
-        # Text operations
-        if 'uppercase' in goal_lower or 'upper' in goal_lower:
-            text = context.get('text', 'hello world')
-            steps.append(WorkflowStep('text', 'uppercase', (text,)))
-        
-        if 'lowercase' in goal_lower or 'lower' in goal_lower:
-            text = context.get('text', 'HELLO WORLD')
-            steps.append(WorkflowStep('text', 'lowercase', (text,)))
-        
-        if 'reverse' in goal_lower:
-            text = context.get('text', 'hello')
-            steps.append(WorkflowStep('text', 'reverse', (text,)))
-        
-        if 'length' in goal_lower or 'count' in goal_lower:
-            text = context.get('text', 'hello world')
-            steps.append(WorkflowStep('text', 'length', (text,)))
-        
-        # Data operations
-        if 'fetch' in goal_lower or 'retrieve' in goal_lower or 'get data' in goal_lower:
-            query = context.get('query', 'default')
-            steps.append(WorkflowStep('data', 'fetch', (query,)))
-        
-        if 'analyze' in goal_lower or 'analysis' in goal_lower:
-            data = context.get('data', [1, 2, 3, 4, 5])
-            steps.append(WorkflowStep('data', 'analyze', (data,)))
-        
+        for server_id, tool_name, ctx_key, default, wrap_single in template:
+            value = context.get(ctx_key, default)
+            args = (value,) if wrap_single else value
+            steps.append(WorkflowStep(server_id, tool_name, args))
+
         return Workflow(steps=steps, goal=goal)
     
     async def execute_workflow(self, workflow: Workflow, 
@@ -212,70 +322,120 @@ class WorkflowOrchestrator:
         Execute each step in sequence and update the context.
         Implements error handling and recovery strategies.
         """
-        results: List[Dict[str, Any]] = []
-        
-        for i, step in enumerate(workflow.steps):
-            execution_record = {
-                "step_id": step.id,
-                "step_index": i,
-                "server_id": step.server_id,
-                "tool_name": step.tool_name,
-                "args": step.args,
-                "status": TaskStatus.RUNNING.value,
-                "started_at": datetime.now().isoformat()
-            }
-            
-            try:
-                if step.server_id not in servers:
-                    raise ValueError(f"Server not found: {step.server_id}")
-                
-                server = servers[step.server_id]
+        return [
+            await self._execute_step(i, step, servers, context)
+            for i, step in enumerate(workflow.steps)
+        ]
+
+    async def _execute_step(self, i: int, step: WorkflowStep,
+                            servers: Dict[str, DummyServer],
+                            context: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute one step, record it in the history, return its record."""
+        # Work in locals during the hot path; the record dict is
+        # built once, in its final shape, after the step finishes
+        started_ns = time.time_ns()
+        result = error = None
+
+        try:
+            if step.server_id not in servers:
+                raise ValueError(f"Server not found: {step.server_id}")
+
+            server = servers[step.server_id]
+            if server.has_sync_tool(step.tool_name):
+                result = server.call_tool_sync(step.tool_name, *step.args)
+            else:
                 result = await server.call_tool(step.tool_name, *step.args)
-                
-                # Store result in context for downstream use
-                context[f"{step.tool_name}_result"] = result
-                
-                execution_record["status"] = TaskStatus.COMPLETED.value
-                execution_record["result"] = result
-                execution_record["completed_at"] = datetime.now().isoformat()
-                
-            except Exception as e:
-                execution_record["status"] = TaskStatus.FAILED.value
-                execution_record["error"] = str(e)
-                execution_record["completed_at"] = datetime.now().isoformat()
-                
-                # Simple retry logic could be added here
-                # For now, we continue with other steps
-            
-            results.append(execution_record)
-            self.execution_history.append(execution_record)
-        
+
+            # Store result in context for downstream use
+            context[f"{step.tool_name}_result"] = result
+            status = TaskStatus.COMPLETED
+
+        except Exception as e:
+            status, error = TaskStatus.FAILED, str(e)
+
+            # Simple retry logic could be added here
+            # For now, we continue with other steps
+
+        completed_ns = time.time_ns()
+        record = {
+            "step_id": step.id,
+            "step_index": i,
+            "server_id": step.server_id,
+            "tool_name": step.tool_name,
+            "args": step.args,
+            "status": status.value,
+            "result": result,
+            "error": error,
+            "started_ns": started_ns,
+            "completed_ns": completed_ns,
+        }
+        self._record_execution(step.id, step.server_id, step.tool_name,
+                               status, started_ns, completed_ns, error)
+        return record
+
+    @staticmethod
+    def _stage_steps(steps: List[WorkflowStep]) -> List[List[WorkflowStep]]:
+        """Topologically group steps into stages of independent steps."""
+        staged: List[List[WorkflowStep]] = []
+        placed: set = set()
+        remaining = list(steps)
+        while remaining:
+            stage = [s for s in remaining
+                     if all(dep in placed for dep in s.depends_on)]
+            if not stage:
+                # Unsatisfiable dependencies: fall back to serial order
+                stage = [remaining[0]]
+            for s in stage:
+                placed.add(s.id)
+            staged.append(stage)
+            remaining = [s for s in remaining if s.id not in placed]
+        return staged
+
+    async def execute_staged(self, workflow: Workflow,
+                             servers: Dict[str, DummyServer],
+                             context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Execute the workflow stage by stage: steps whose dependencies
+        are satisfied run concurrently in one gather, so each stage
+        costs its slowest step rather than the sum.
+        """
+        results: List[Dict[str, Any]] = []
+        index = {step.id: i for i, step in enumerate(workflow.steps)}
+        for stage in self._stage_steps(workflow.steps):
+            stage_results = await asyncio.gather(
+                *(self._execute_step(index[s.id], s, servers, context)
+                  for s in stage)
+            )
+            results.extend(stage_results)
         return results
     
     async def execute_parallel(self, workflow: Workflow,
                                servers: Dict[str, DummyServer],
                                context: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Execute independent steps in parallel for efficiency."""
-        tasks = []
-        
-        for step in workflow.steps:
-            async def execute_step(s):
-                if s.server_id in servers:
-                    return await servers[s.server_id].call_tool(s.tool_name, *s.args)
-                return None
-            tasks.append(execute_step(step))
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        return [
-            {
+        n = len(workflow.steps)
+        tasks = [None] * n
+
+        for i, step in enumerate(workflow.steps):
+            tasks[i] = (
+                servers[step.server_id].call_tool(step.tool_name, *step.args)
+                if step.server_id in servers
+                else _none_coro()
+            )
+
+        raw = await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = [None] * n
+        for i in range(n):
+            step, result = workflow.steps[i], raw[i]
+            failed = isinstance(result, Exception)
+            results[i] = {
                 "step_id": step.id,
-                "result": result if not isinstance(result, Exception) else None,
-                "error": str(result) if isinstance(result, Exception) else None,
-                "status": TaskStatus.FAILED.value if isinstance(result, Exception) else TaskStatus.COMPLETED.value
+                "result": None if failed else result,
+                "error": str(result) if failed else None,
+                "status": TaskStatus.FAILED.value if failed else TaskStatus.COMPLETED.value
             }
-            for step, result in zip(workflow.steps, results)
-        ]
+        return results
 
 
 # ============================================================================
@@ -288,10 +448,26 @@ class SecurityHandler:
     permission delegation, and data protection.
     """
     
+    # How many queued entries to format per drain wake-up
+    _DRAIN_BATCH = 256
+
     def __init__(self):
         self.credentials: Dict[str, Dict[str, Any]] = {}
         self.permissions: Dict[str, List[str]] = {}
-        self.audit_log: List[Dict[str, Any]] = []
+        # Permission lists compiled per user into
+        # (exact operations, wildcard server prefixes, allow-everything)
+        # so check_permission is O(1) instead of a pattern scan
+        self._compiled_perms: Dict[str, tuple] = {}
+        # Ring buffer: long-running clients keep the newest N entries
+        # instead of growing without bound. Each entry carries a
+        # monotonic "seq" so callers can page with since_seq.
+        self.audit_log: deque = deque(maxlen=10_000)
+        self._audit_seq = 0
+        # Entries are enqueued as plain tuples on the hot path and only
+        # formatted (ISO timestamps, dict construction) when drained in
+        # batches by a background task.
+        self._audit_queue: asyncio.Queue = asyncio.Queue(maxsize=10_000)
+        self._drain_task: Optional[asyncio.Task] = None
     
     def register_server_credentials(self, server_id: str, credentials: Dict[str, Any]):
         """Register credentials for a specific server."""
@@ -305,32 +481,102 @@ class SecurityHandler:
     def set_permissions(self, user_id: str, allowed_operations: List[str]):
         """Set allowed operations for a user."""
         self.permissions[user_id] = allowed_operations
-    
+        exact = set()
+        prefixes = set()
+        allow_all = False
+        for op in allowed_operations:
+            if op == "*":
+                allow_all = True
+            elif op.endswith(":*"):
+                prefixes.add(op[:-2])
+            else:
+                exact.add(op)
+        self._compiled_perms[user_id] = (
+            frozenset(exact), frozenset(prefixes), allow_all
+        )
+
     def check_permission(self, user_id: str, operation: str) -> bool:
         """Check if a user has permission for an operation."""
-        user_perms = self.permissions.get(user_id, [])
-        if operation in user_perms or "*" in user_perms:
+        compiled = self._compiled_perms.get(user_id)
+        if compiled is None:
+            return False
+        exact, prefixes, allow_all = compiled
+        if allow_all or operation in exact:
             return True
-        # Check for wildcard patterns like "text:*"
-        server_id = operation.split(":")[0] if ":" in operation else ""
-        wildcard = f"{server_id}:*"
-        return wildcard in user_perms
+        # Wildcard patterns like "text:*" were compiled to prefix sets
+        return operation.partition(":")[0] in prefixes
     
     def log_access(self, user_id: str, operation: str, server_id: str, success: bool):
-        """Log access for audit purposes."""
-        self.audit_log.append({
-            "timestamp": datetime.now().isoformat(),
+        """
+        Log access for audit purposes.
+        Hot path: one tuple allocation and a queue put - formatting is
+        deferred to the background drain task.
+        """
+        self._audit_queue.put_nowait(
+            (time.time(), user_id, operation, server_id, success)
+        )
+        if self._drain_task is None:
+            try:
+                self._drain_task = asyncio.get_running_loop().create_task(
+                    self._drain_audit_queue()
+                )
+            except RuntimeError:
+                # No running loop (sync caller) - format inline
+                self._flush_pending()
+
+    def _format_entry(self, entry: tuple) -> Dict[str, Any]:
+        timestamp, user_id, operation, server_id, success = entry
+        seq = self._audit_seq
+        self._audit_seq = seq + 1
+        return {
+            "seq": seq,
+            "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
             "user_id": user_id,
             "operation": operation,
             "server_id": server_id,
             "success": success
-        })
-    
-    def get_audit_log(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get audit log, optionally filtered by user."""
+        }
+
+    def _flush_pending(self):
+        """Drain any queued entries synchronously."""
+        while True:
+            try:
+                entry = self._audit_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            self.audit_log.append(self._format_entry(entry))
+
+    async def _drain_audit_queue(self):
+        """Background task: pull queued entries and format them in batches."""
+        while True:
+            entry = await self._audit_queue.get()
+            batch = [entry]
+            for _ in range(self._DRAIN_BATCH - 1):
+                try:
+                    batch.append(self._audit_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            self.audit_log.extend(self._format_entry(e) for e in batch)
+
+    def get_audit_log(self, user_id: Optional[str] = None,
+                      limit: Optional[int] = None,
+                      since_seq: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get audit log entries, optionally filtered by user, capped to
+        the newest `limit`, or restricted to entries after `since_seq`.
+        """
+        self._flush_pending()
+        entries = self.audit_log
+        if since_seq is not None:
+            entries = (e for e in entries if e["seq"] > since_seq)
         if user_id:
-            return [e for e in self.audit_log if e["user_id"] == user_id]
-        return self.audit_log
+            entries = (e for e in entries if e["user_id"] == user_id)
+        if entries is self.audit_log:
+            if limit is None:
+                return list(entries)
+            return list(islice(entries, max(0, len(entries) - limit), None))
+        entries = list(entries)
+        return entries if limit is None else entries[-limit:]
 
 
 # ============================================================================
@@ -351,15 +597,24 @@ class MCPClient:
         self.security = SecurityHandler()
         self.capabilities_cache: Dict[str, List[Dict[str, Any]]] = {}
         self.session_start = datetime.now()
+        # One shared transport session for all servers. For remote MCP
+        # servers this would be a pooled aiohttp.ClientSession created on
+        # first connect; the in-process demo servers simply ignore it.
+        self.transport_session: Optional[Any] = None
     
     async def connect_server(self, server_id: str, server: DummyServer) -> Dict[str, Any]:
         """
         Connect to an MCP server and discover its capabilities.
         This is an ongoing conversation - capabilities can change over time.
         """
+        # Share the client-owned transport session so every server reuses
+        # the same connection pool instead of opening one per call
+        if server.session is None:
+            server.session = self.transport_session
+
         # Discover capabilities
         capabilities = await server.discover_capabilities()
-        
+
         # Cache capabilities
         self.capabilities_cache[server_id] = capabilities
         
@@ -372,6 +627,22 @@ class MCPClient:
             "capabilities": [c["name"] for c in capabilities]
         }
     
+    async def close(self):
+        """
+        Close all servers and the shared transport session.
+        Prevents "unclosed connector" warnings when a real pooled
+        session is in use.
+        """
+        if self.security._drain_task is not None:
+            self.security._drain_task.cancel()
+            self.security._drain_task = None
+            self.security._flush_pending()
+        for server in self.servers.values():
+            await server.close()
+        if self.transport_session is not None:
+            await self.transport_session.close()
+            self.transport_session = None
+
     async def disconnect_server(self, server_id: str) -> bool:
         """Disconnect from a server."""
         if server_id in self.servers:
@@ -418,8 +689,8 @@ class MCPClient:
             available_tools
         )
         
-        # Execute the workflow
-        results = await self.orchestrator.execute_workflow(
+        # Execute the workflow; independent steps run concurrently
+        results = await self.orchestrator.execute_staged(
             workflow,
             self.servers,
             self.context.store
@@ -448,7 +719,11 @@ class MCPClient:
             raise ValueError(f"Server not connected: {server_id}")
         
         try:
-            result = await self.servers[server_id].call_tool(tool_name, *args)
+            server = self.servers[server_id]
+            if server.has_sync_tool(tool_name):
+                result = server.call_tool_sync(tool_name, *args)
+            else:
+                result = await server.call_tool(tool_name, *args)
             self.security.log_access(user_id, operation, server_id, True)
             
             # Update context
@@ -478,7 +753,7 @@ class MCPClient:
             "session_start": self.session_start.isoformat(),
             "connected_servers": list(self.servers.keys()),
             "context_keys": list(self.context.store.keys()),
-            "execution_history_count": len(self.orchestrator.execution_history)
+            "execution_history_count": self.orchestrator.history_len()
         }
 
 
@@ -577,8 +852,8 @@ async def demo():
         'fetch': lambda query: f"Data for query: {query}",
         'analyze': lambda data: {
             'count': len(data),
-            'sum': sum(data) if isinstance(data, list) else 0,
-            'avg': sum(data) / len(data) if isinstance(data, list) and len(data) > 0 else 0
+            'sum': sum(data) if isinstance(data, (list, tuple)) else 0,
+            'avg': sum(data) / len(data) if isinstance(data, (list, tuple)) and len(data) > 0 else 0
         }
     })
     
@@ -589,8 +864,13 @@ async def demo():
     print("\n1️⃣  Connecting to Servers (Capability Discovery):")
     print("-" * 45)
     
-    for name, server in [("math", math_server), ("text", text_server), ("data", data_server)]:
-        result = await client.connect_server(name, server)
+    # Connect to all servers concurrently - wall time is the slowest
+    # handshake instead of the sum of all three
+    servers = [("math", math_server), ("text", text_server), ("data", data_server)]
+    connect_results = await asyncio.gather(
+        *[client.connect_server(name, server) for name, server in servers]
+    )
+    for (name, _), result in zip(servers, connect_results):
         print(f"  {name}: {result['capabilities']}")
     
     # Test 2: View all capabilities
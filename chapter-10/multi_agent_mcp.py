@@ -36,12 +36,27 @@ class DummyServer:
 class MCPClient:
     def __init__(self, server):
         self.server = server
+        # Bound tool callables cached at first use so every call is one
+        # dict lookup plus a direct await, with no per-call indirection
+        # through server.call_tool
+        self._dispatch = None
+
+    async def _ensure_dispatch(self):
+        if self._dispatch is None:
+            names = await self.server.list_tools()
+            self._dispatch = {name: self.server.tools[name] for name in names}
 
     async def list_tools(self):
-        return await self.server.list_tools()
+        await self._ensure_dispatch()
+        return list(self._dispatch.keys())
 
     async def call(self, name, arguments):
-        return await self.server.call_tool(name, arguments)
+        await self._ensure_dispatch()
+        try:
+            func = self._dispatch[name]
+        except KeyError:
+            raise ValueError('Tool not found') from None
+        return await func(**arguments)
 
 class ResearchAgent:
     def __init__(self, name, mcp_client):
@@ -60,15 +75,20 @@ class AnalysisAgent:
         return await self.client.call('analyze_sentiment', {'text': text})
 
 async def orchestrator():
+    # Eager tasks (Python 3.12+) start running synchronously at creation,
+    # skipping one event-loop round-trip per child task
+    if hasattr(asyncio, 'eager_task_factory'):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
     server = DummyServer()
     client = MCPClient(server)
     research_agent = ResearchAgent('research', client)
     analysis_agent = AnalysisAgent('analysis', client)
 
-    weather_future = research_agent.gather_weather('New York')
-    sentiment_future = analysis_agent.analyze_text('This is a great day!')
-    weather_result, sentiment_result = await asyncio.gather(weather_future, sentiment_future)
-    print('Weather Result:', weather_result)
-    print('Sentiment Result:', sentiment_result)
+    async with asyncio.TaskGroup() as tg:
+        weather_task = tg.create_task(research_agent.gather_weather('New York'))
+        sentiment_task = tg.create_task(analysis_agent.analyze_text('This is a great day!'))
+    print('Weather Result:', weather_task.result())
+    print('Sentiment Result:', sentiment_task.result())
 
 asyncio.run(orchestrator())
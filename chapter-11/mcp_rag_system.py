@@ -1,36 +1,177 @@
 # Simplified RAG system that does not rely on any external MCP libraries.
 # In this example we simulate MCP servers by storing data in in‑memory dictionaries.
 
+import heapq
+from functools import lru_cache
+
+# Scoring picks the fastest backend available: TF-IDF via scikit-learn,
+# then vectorized bitset Jaccard via NumPy 2.0, then pure-Python Jaccard,
+# so the example stays dependency-free.
+try:
+    import numpy as np
+    _HAVE_NUMPY = True
+except ImportError:
+    _HAVE_NUMPY = False
+try:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    _HAVE_SKLEARN = True
+except ImportError:
+    _HAVE_SKLEARN = False
+
+# np.bitwise_count (the vectorized popcount) arrived in NumPy 2.0
+_HAVE_BITSET = _HAVE_NUMPY and hasattr(np, 'bitwise_count')
+
+
 class MCPRAGSystem:
     """A simple RAG system using local data sources to simulate MCP retrieval."""
 
     def __init__(self):
         self.data_sources = {}
+        # Flat (source, uri, content) view of all documents, kept in sync
+        # with data_sources so scoring never re-walks the nested dicts
+        self._docs = []
+        # Parallel (token_set, token_count) pairs so the Jaccard path
+        # never re-tokenizes document content at query time
+        self._token_sets = []
+        if _HAVE_SKLEARN:
+            self._vectorizer = TfidfVectorizer(lowercase=True)
+            self._doc_matrix = None
+        elif _HAVE_BITSET:
+            # token -> bit position; each document becomes a row of
+            # uint64 lanes with one bit per vocabulary token
+            self._vocab = {}
+            self._doc_bits = None
+        # Bumped on every corpus change so stale cached results die with
+        # their version; the cache itself is per-instance
+        self._version = 0
+        self._retrieve_cached = lru_cache(maxsize=512)(self._retrieve_uncached)
 
     def add_data_source(self, source_name: str, documents: dict) -> None:
         """Add a data source with a mapping of URI to text content."""
         self.data_sources[source_name] = documents
+        for uri, content in documents.items():
+            self._docs.append((source_name, uri, content))
+            tokens = frozenset(content.lower().split())
+            self._token_sets.append((tokens, len(tokens)))
+        if _HAVE_SKLEARN:
+            # Re-fit once per corpus change, not once per query
+            self._doc_matrix = self._vectorizer.fit_transform(
+                [content for _, _, content in self._docs]
+            )
+        elif _HAVE_BITSET:
+            self._rebuild_bitsets()
+        self._version += 1
 
     def retrieve_information(self, query: str, max_results: int = 5):
         """Retrieve relevant information from local data sources."""
-        query_words = set(query.lower().split())
+        # Repeated queries against an unchanged corpus are answered from
+        # the memoized scoring pass
+        return list(self._retrieve_cached(
+            query.strip().lower(), self._version, max_results
+        ))
+
+    def _retrieve_uncached(self, query: str, version: int, max_results: int):
+        if not self._docs:
+            return ()
+        if _HAVE_SKLEARN:
+            return tuple(self._retrieve_tfidf(query, max_results))
+        if _HAVE_BITSET:
+            return tuple(self._retrieve_bitset(query, max_results))
+        return tuple(self._retrieve_jaccard(query, max_results))
+
+    def _rebuild_bitsets(self) -> None:
+        """Pack each document's token set into uint64 bitset lanes."""
+        for tokens, _ in self._token_sets:
+            for token in tokens:
+                self._vocab.setdefault(token, len(self._vocab))
+        lanes = (len(self._vocab) + 63) // 64
+        bits = np.zeros((len(self._docs), lanes), dtype=np.uint64)
+        for i, (tokens, _) in enumerate(self._token_sets):
+            for token in tokens:
+                idx = self._vocab[token]
+                bits[i, idx >> 6] |= np.uint64(1 << (idx & 63))
+        self._doc_bits = bits
+
+    def _retrieve_bitset(self, query: str, max_results: int):
+        """Jaccard over all documents as vectorized popcounts of bitsets."""
+        q_bits = np.zeros(self._doc_bits.shape[1], dtype=np.uint64)
+        out_of_vocab = 0
+        for token in frozenset(query.lower().split()):
+            idx = self._vocab.get(token)
+            if idx is None:
+                # Unknown tokens still enlarge the union
+                out_of_vocab += 1
+            else:
+                q_bits[idx >> 6] |= np.uint64(1 << (idx & 63))
+
+        intersection = np.bitwise_count(self._doc_bits & q_bits).sum(axis=1)
+        union = np.bitwise_count(self._doc_bits | q_bits).sum(axis=1) + out_of_vocab
+        scores = intersection / np.maximum(union, 1)
+
+        k = min(max_results, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for idx in top:
+            score = float(scores[idx])
+            if score <= 0:
+                continue
+            source_name, uri, content = self._docs[idx]
+            results.append({
+                'source': source_name,
+                'uri': uri,
+                'content': content[:200],  # truncate for display
+                'relevance_score': score
+            })
+        return results
+
+    def _retrieve_tfidf(self, query: str, max_results: int):
+        """Score all documents with one sparse matrix product."""
+        query_vec = self._vectorizer.transform([query])
+        scores = (self._doc_matrix @ query_vec.T).toarray().ravel()
+
+        # argpartition selects the top-k in O(N); only those k get sorted
+        k = min(max_results, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for idx in top:
+            score = float(scores[idx])
+            if score <= 0:
+                continue
+            source_name, uri, content = self._docs[idx]
+            results.append({
+                'source': source_name,
+                'uri': uri,
+                'content': content[:200],  # truncate for display
+                'relevance_score': score
+            })
+        return results
+
+    def _retrieve_jaccard(self, query: str, max_results: int):
+        """Pure-Python fallback: Jaccard similarity over token sets."""
+        query_words = frozenset(query.lower().split())
+        query_len = len(query_words)
         results = []
-        for source_name, docs in self.data_sources.items():
-            for uri, content in docs.items():
-                content_words = set(content.lower().split())
-                # Simple Jaccard similarity
-                intersection = query_words & content_words
-                union = query_words | content_words
-                score = len(intersection) / len(union) if union else 0.0
-                if score > 0:
-                    results.append({
-                        'source': source_name,
-                        'uri': uri,
-                        'content': content[:200],  # truncate for display
-                        'relevance_score': score
-                    })
-        results.sort(key=lambda x: x['relevance_score'], reverse=True)
-        return results[:max_results]
+        for (source_name, uri, content), (content_words, content_len) in zip(
+                self._docs, self._token_sets):
+            # Simple Jaccard similarity over the precomputed token sets:
+            # |union| = |q| + |doc| - |intersection|, no set materialized
+            intersection = len(query_words & content_words)
+            union = query_len + content_len - intersection
+            score = intersection / union if union else 0.0
+            if score > 0:
+                results.append({
+                    'source': source_name,
+                    'uri': uri,
+                    'content': content[:200],  # truncate for display
+                    'relevance_score': score
+                })
+        # O(R log k) top-k selection instead of sorting all R matches
+        return heapq.nlargest(max_results, results,
+                              key=lambda x: x['relevance_score'])
 
     def generate_response(self, query: str, retrieved_info: list) -> str:
         """Generate a simple response using retrieved information."""
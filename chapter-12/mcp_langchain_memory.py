@@ -2,15 +2,21 @@ class MemoryMCPServer:
     """Minimal in-memory MCP server for conversation history."""
     def __init__(self):
         self.messages = []  # list of {'sender': ..., 'text': ...}
+        # Rendered history is appended incrementally so reads never
+        # rebuild the whole transcript
+        self._buf = bytearray()
 
     def list_resources(self):
         return ['history']
 
     def read_resource(self, name):
-        return '\n'.join(f"{m['sender']}: {m['text']}" for m in self.messages)
+        # O(|result|) decode instead of re-joining every message; drop
+        # the trailing separator to match the old join() output
+        return self._buf[:-1].decode() if self._buf else ''
 
     def write_resource(self, name, message):
         self.messages.append(message)
+        self._buf += f"{message['sender']}: {message['text']}\n".encode()
 
 # In LangChain, you'd implement a Memory class that calls read_resource() and write_resource()
 # on the MCP server to persist context across interactions.
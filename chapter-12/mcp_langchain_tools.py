@@ -1,6 +1,48 @@
+import asyncio
+
 from langchain.tools import Tool
 from mcp.client import ClientSession
 
+# Serializer for any outgoing JSON-RPC payload (requests, notifications).
+# orjson is C-implemented and 2-5x faster than the stdlib encoder; fall
+# back to a compact stdlib encoding when it is not installed.
+try:
+    import orjson
+
+    def dumps_jsonrpc(message: dict) -> bytes:
+        """Encode a JSON-RPC message to bytes ready for the transport."""
+        return orjson.dumps(message)
+except ImportError:
+    import json
+
+    def dumps_jsonrpc(message: dict) -> bytes:
+        """Encode a JSON-RPC message to bytes ready for the transport."""
+        return json.dumps(message, separators=(",", ":")).encode()
+
+# Pool of initialized sessions keyed by server URL so each tool call
+# reuses an open connection instead of paying the initialize() handshake
+_SESSIONS: dict = {}
+_SESSIONS_LOCK = asyncio.Lock()
+
+async def _get_session(server_url) -> ClientSession:
+    """Return an initialized ClientSession for server_url, creating it once."""
+    session = _SESSIONS.get(server_url)
+    if session is None:
+        async with _SESSIONS_LOCK:
+            session = _SESSIONS.get(server_url)
+            if session is None:
+                session = ClientSession(server_url)
+                await session.initialize()
+                _SESSIONS[server_url] = session
+    return session
+
+async def aclose_all():
+    """Close every pooled session (call at application shutdown)."""
+    async with _SESSIONS_LOCK:
+        for session in _SESSIONS.values():
+            await session.close()
+        _SESSIONS.clear()
+
 class MCPToolWrapper(Tool):
     def __init__(self, server_url, tool_name, input_schema):
         super().__init__(name=tool_name, description=input_schema.get('description'))
@@ -9,17 +51,15 @@ class MCPToolWrapper(Tool):
         self.input_schema = input_schema
 
     async def __call__(self, **kwargs):
-        async with ClientSession(self.server_url) as session:
-            await session.initialize()
-            # call the MCP tool via JSON-RPC
-            result = await session.call_tool(self.tool_name, kwargs)
-            return result.content[0].text
+        session = await _get_session(self.server_url)
+        # call the MCP tool via JSON-RPC over the pooled session
+        result = await session.call_tool(self.tool_name, kwargs)
+        return result.content[0].text
 
 # Discover tools and register wrappers
 async def register_mcp_tools(client, server_url):
-    async with ClientSession(server_url) as session:
-        await session.initialize()
-        tool_defs = (await session.list_tools()).tools
-        for tool_def in tool_defs:
-            wrapper = MCPToolWrapper(server_url, tool_def.name, tool_def.inputSchema)
-            client.add_tool(wrapper)
+    session = await _get_session(server_url)
+    tool_defs = (await session.list_tools()).tools
+    for tool_def in tool_defs:
+        wrapper = MCPToolWrapper(server_url, tool_def.name, tool_def.inputSchema)
+        client.add_tool(wrapper)
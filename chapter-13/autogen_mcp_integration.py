@@ -1,3 +1,20 @@
+import re
+from collections import Counter
+
+# Sentiment keyword table: polarity per term. The compiled alternation
+# scans the text once in C regardless of how many terms are registered,
+# instead of one str.count pass per keyword.
+_SENTIMENT_TERMS = {
+    "improves": 1,
+    "enhances": 1,
+    "boosts": 1,
+    "reduces": -1,
+    "degrades": -1,
+    "hurts": -1,
+}
+_SENTIMENT_RE = re.compile("|".join(map(re.escape, _SENTIMENT_TERMS)))
+
+
 class DummyMCPServer:
     """Expose simple tools via list_tools() and call_tool()."""
 
@@ -30,9 +47,10 @@ class DummyMCPServer:
         return "\n".join(matches) if matches else "No documents found."
 
     def analyze(self, data: str) -> str:
-        # Count positive and negative words in the data
-        positive = data.lower().count("improves")
-        negative = data.lower().count("reduces")
+        # Count positive and negative words in a single scan of the data
+        counts = Counter(_SENTIMENT_RE.findall(data.lower()))
+        positive = sum(n for term, n in counts.items() if _SENTIMENT_TERMS[term] > 0)
+        negative = sum(n for term, n in counts.items() if _SENTIMENT_TERMS[term] < 0)
         return (
             f"Analysis summary: {positive} positive signal(s), "
             f"{negative} negative signal(s)."
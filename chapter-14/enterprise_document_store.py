@@ -1,3 +1,14 @@
+import re
+from collections import Counter
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokenize(text: str) -> list:
+    """Lowercase and split text into alphanumeric tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
 class DocumentStore:
     """Simple document store that mimics an MCP resource provider."""
     def __init__(self) -> None:
@@ -49,46 +60,134 @@ class DocumentStore:
                 "tags": ["marketing", "customers", "success"],
             },
         ]
-
-    def list_resources(self) -> list:
-        """Return a list of document metadata similar to an MCP `resources/list` response."""
-        resources = []
+        # Inverted index (token -> doc ids) plus filter sets, built once
+        # so searches intersect small posting lists instead of scanning
+        # every document's text
+        self._index: dict = {}
+        self._by_department: dict = {}
+        self._by_classification: dict = {}
         for idx, doc in enumerate(self.documents):
-            resources.append({
+            self._index_doc(idx, doc)
+        self._resources = self._build_resources()
+        # Summary counters maintained incrementally on mutation; the
+        # formatted summary string is cached until marked dirty
+        self._dept_counts = Counter(doc["department"] for doc in self.documents)
+        self._class_counts = Counter(doc["classification"] for doc in self.documents)
+        self._summary_cache: str | None = None
+
+    def _index_doc(self, idx: int, doc: dict) -> None:
+        """Add one document to the inverted index and filter sets.
+
+        Also lowercases each text field once so queries never casefold
+        document content.
+        """
+        doc["_lc_title"] = doc["title"].lower()
+        doc["_lc_content"] = doc["content"].lower()
+        doc["_lc_tags"] = [tag.lower() for tag in doc["tags"]]
+        tokens = _tokenize(doc["title"]) + _tokenize(doc["content"])
+        for tag in doc["tags"]:
+            tokens.extend(_tokenize(tag))
+        for token in tokens:
+            self._index.setdefault(token, set()).add(idx)
+        self._by_department.setdefault(doc["department"], set()).add(idx)
+        self._by_classification.setdefault(doc["classification"], set()).add(idx)
+
+    def _add_doc(self, doc: dict) -> None:
+        """Append a document, keeping counters and cached views current."""
+        self.documents.append(doc)
+        self._index_doc(len(self.documents) - 1, doc)
+        self._dept_counts[doc["department"]] += 1
+        self._class_counts[doc["classification"]] += 1
+        self._summary_cache = None
+        self._invalidate()
+
+    def _remove_doc(self, idx: int) -> None:
+        """Remove a document, keeping counters and cached views current."""
+        doc = self.documents.pop(idx)
+        self._dept_counts[doc["department"]] -= 1
+        self._class_counts[doc["classification"]] -= 1
+        # Doc ids shift on removal, so rebuild the index structures
+        self._index.clear()
+        self._by_department.clear()
+        self._by_classification.clear()
+        for i, remaining in enumerate(self.documents):
+            self._index_doc(i, remaining)
+        self._summary_cache = None
+        self._invalidate()
+
+    def _build_resources(self) -> list:
+        return [
+            {
                 "uri": f"doc://{idx}",
                 "name": doc["title"],
                 "description": f"{doc['classification'].title()} document from {doc['department']} by {doc['author']}"
-            })
-        return resources
+            }
+            for idx, doc in enumerate(self.documents)
+        ]
+
+    def _invalidate(self) -> None:
+        """Rebuild cached views after a mutation of self.documents."""
+        self._resources = self._build_resources()
+
+    def list_resources(self) -> list:
+        """Return a list of document metadata similar to an MCP `resources/list` response."""
+        # The listing is immutable in this demo, so repeated MCP
+        # `resources/list` requests return the prebuilt response
+        return self._resources
 
     def search_documents(self, query: str, department: str | None = None, classification: str | None = None) -> list:
         """Return documents whose title, content or tags match a query with optional filters."""
-        query_lower = query.lower()
+        tokens = _tokenize(query)
+        if not tokens:
+            return []
+
+        # Intersect posting lists: O(tokens * matches) instead of a
+        # substring scan over every document
+        matches = self._index.get(tokens[0], set()).copy()
+        for token in tokens[1:]:
+            matches &= self._index.get(token, set())
+            if not matches:
+                break
+
+        if not matches:
+            # Partial-word fallback (e.g. "secur"): substring match over
+            # the lowercased fields precomputed at construction time
+            query_lower = query.lower()
+            matches = {
+                idx for idx, doc in enumerate(self.documents)
+                if (query_lower in doc["_lc_title"] or
+                    query_lower in doc["_lc_content"] or
+                    any(query_lower in tag for tag in doc["_lc_tags"]))
+            }
+            if not matches:
+                return []
+
+        # Filter pushdown via the precomputed sets
+        if department:
+            matches &= self._by_department.get(department, set())
+        if classification:
+            matches &= self._by_classification.get(classification, set())
+
         results = []
-        for idx, doc in enumerate(self.documents):
-            if (query_lower in doc["title"].lower() or
-                query_lower in doc["content"].lower() or
-                any(query_lower in tag for tag in doc["tags"])):
-                if department and doc["department"] != department:
-                    continue
-                if classification and doc["classification"] != classification:
-                    continue
-                results.append({
-                    "title": doc["title"],
-                    "department": doc["department"],
-                    "author": doc["author"],
-                    "classification": doc["classification"],
-                    "preview": doc["content"][:100],
-                    "uri": f"doc://{idx}"
-                })
+        for idx in sorted(matches):
+            doc = self.documents[idx]
+            results.append({
+                "title": doc["title"],
+                "department": doc["department"],
+                "author": doc["author"],
+                "classification": doc["classification"],
+                "preview": doc["content"][:100],
+                "uri": f"doc://{idx}"
+            })
         return results
 
     def get_summary(self) -> str:
         """Return summary statistics about the document store."""
+        if self._summary_cache is not None:
+            return self._summary_cache
         total_docs = len(self.documents)
-        from collections import Counter
-        dept_counts = Counter(doc["department"] for doc in self.documents)
-        class_counts = Counter(doc["classification"] for doc in self.documents)
+        dept_counts = self._dept_counts
+        class_counts = self._class_counts
         summary = (
             "Enterprise Document Store Summary\n"
             "===============================\n\n"
@@ -102,6 +201,7 @@ class DocumentStore:
         summary += "\nDocuments by Classification:\n"
         for classif, count in class_counts.items():
             summary += f"  • {classif}: {count} documents\n"
+        self._summary_cache = summary
         return summary
 
 
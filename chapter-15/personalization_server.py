@@ -1,6 +1,16 @@
+import heapq
 import json
+from collections import Counter, defaultdict
 from datetime import datetime
 
+# Scoring vectorizes over the whole catalog when NumPy 2.0 is available
+# (np.bitwise_count); the pure-Python loop remains as the fallback.
+try:
+    import numpy as np
+    _HAVE_NUMPY = hasattr(np, "bitwise_count")
+except ImportError:
+    _HAVE_NUMPY = False
+
 class PersonalizationServer:
     """A minimal personalization system demonstrating MCP-like operations."""
     def __init__(self):
@@ -25,6 +35,79 @@ class PersonalizationServer:
             "article_004": {"title": "Design Thinking Principles", "category": "design", "tags": ["design", "creativity"], "popularity": 0.9},
             "article_005": {"title": "Python Programming Basics", "category": "technology", "tags": ["programming", "python", "beginner"], "popularity": 0.85},
         }
+        # Profiles are stable, so the lowercased interests and experience
+        # level each request needs are normalized once here
+        self._profile_norm = {
+            user_id: (
+                tuple(interest.lower() for interest in profile.get("interests", [])),
+                profile.get("experience_level", "beginner").lower(),
+            )
+            for user_id, profile in self.user_profiles.items()
+        }
+        # Per-user rollups of the behaviour history: items already seen
+        # and total action count, so requests don't rescan the history
+        self._viewed: dict = defaultdict(set)
+        self._action_counts: dict = Counter()
+        for user_id, _, item_id, _ in self.behaviour_history:
+            self._viewed[user_id].add(item_id)
+            self._action_counts[user_id] += 1
+        # Inverted index: lowercased tag -> ids of items carrying it.
+        # Interest matching unions these posting lists instead of
+        # rescanning every item's tag list per request.
+        # All catalog ids as a frozenset, so candidate selection is a
+        # set difference against the user's viewed items
+        self._all_item_ids = frozenset(self.content_items)
+        # Case-folded tag sets, built once so requests never re-lowercase
+        # the same tag strings
+        self._tags_lower: dict = {
+            item_id: frozenset(tag.lower() for tag in meta["tags"])
+            for item_id, meta in self.content_items.items()
+        }
+        self._tag_index: dict = defaultdict(set)
+        for item_id, tags in self._tags_lower.items():
+            for tag in tags:
+                self._tag_index[tag].add(item_id)
+        if _HAVE_NUMPY:
+            # Structure-of-arrays catalog: popularity as float32 and tags
+            # as one uint64 bitmask per item (fine for < 64 distinct tags),
+            # so a request scores every item with a few vectorized ops
+            self._item_ids = tuple(self.content_items)
+            self._pop = np.array(
+                [meta["popularity"] for meta in self.content_items.values()],
+                dtype=np.float32
+            )
+            self._tag_id: dict = {}
+            masks = []
+            for item_id in self._item_ids:
+                mask = 0
+                for tag in self._tags_lower[item_id]:
+                    tag_id = self._tag_id.setdefault(tag, len(self._tag_id))
+                    mask |= 1 << tag_id
+                masks.append(mask)
+            self._tag_bits = np.array(masks, dtype=np.uint64)
+        # Resource payloads are static for the process lifetime, so both
+        # renderings are built once and reads are a dict lookup: compact
+        # for machine consumers, indented for humans
+        self._serialized = {}
+        self._serialized_pretty = {}
+        for res in self.list_resources():
+            self._refresh_serialized(res["uri"])
+
+    def _refresh_serialized(self, uri: str) -> None:
+        """(Re)serialize one resource; call after mutating its data."""
+        if uri == "profile://user_profiles":
+            payload = self.user_profiles
+        elif uri == "behavior://user_behavior":
+            payload = [
+                {"user_id": user_id, "action": action, "item_id": item_id, "context": context}
+                for (user_id, action, item_id, context) in self.behaviour_history
+            ]
+        elif uri == "content://content_items":
+            payload = self.content_items
+        else:
+            raise ValueError(f"Unknown resource URI: {uri}")
+        self._serialized[uri] = json.dumps(payload, separators=(",", ":"))
+        self._serialized_pretty[uri] = json.dumps(payload, indent=2)
 
     def list_resources(self):
         """Return URIs and descriptions of available resources."""
@@ -34,19 +117,50 @@ class PersonalizationServer:
             {"uri": "content://content_items", "name": "Content Catalog", "description": "Articles and their metadata"},
         ]
 
-    def read_resource(self, uri: str) -> str:
-        """Return the JSON representation of a resource."""
-        if uri == "profile://user_profiles":
-            return json.dumps(self.user_profiles, indent=2)
-        elif uri == "behavior://user_behavior":
-            return json.dumps([
-                {"user_id": user_id, "action": action, "item_id": item_id, "context": context}
-                for (user_id, action, item_id, context) in self.behaviour_history
-            ], indent=2)
-        elif uri == "content://content_items":
-            return json.dumps(self.content_items, indent=2)
-        else:
-            raise ValueError(f"Unknown resource URI: {uri}")
+    def read_resource(self, uri: str, pretty: bool = False) -> str:
+        """Return the JSON representation of a resource.
+
+        Compact by default; pass pretty=True for indented output.
+        """
+        try:
+            return self._serialized_pretty[uri] if pretty else self._serialized[uri]
+        except KeyError:
+            raise ValueError(f"Unknown resource URI: {uri}") from None
+
+    def _score_vectorized(self, interests, level, context, viewed, limit):
+        """Score the whole catalog with a handful of NumPy expressions."""
+        interest_mask = 0
+        for interest in interests:
+            tag_id = self._tag_id.get(interest)
+            if tag_id is not None:
+                interest_mask |= 1 << tag_id
+        matches = np.bitwise_count(
+            self._tag_bits & np.uint64(interest_mask)
+        ).astype(np.float32)
+
+        score = 0.4 * matches + 0.2 * self._pop
+        level_id = self._tag_id.get(level)
+        if level_id is not None:
+            score += 0.3 * ((self._tag_bits & np.uint64(1 << level_id)) != 0)
+        if context.get("time_of_day") == "morning":
+            beginner_id = self._tag_id.get("beginner")
+            if beginner_id is not None:
+                score += 0.1 * ((self._tag_bits & np.uint64(1 << beginner_id)) != 0)
+        if viewed:
+            viewed_mask = np.fromiter(
+                (item_id in viewed for item_id in self._item_ids),
+                dtype=bool, count=len(self._item_ids)
+            )
+            score[viewed_mask] = -np.inf
+
+        # Partial selection of the top-k, then sort only those k
+        k = min(limit, len(score))
+        top = np.argpartition(-score, k - 1)[:k]
+        top = top[np.argsort(-score[top])]
+        return [
+            (float(score[i]), self._item_ids[i])
+            for i in top if score[i] != -np.inf
+        ]
 
     def get_recommendations(self, user_id: str, context: dict | None = None, limit: int = 3) -> str:
         """Compute simple relevance scores and return a formatted list."""
@@ -55,30 +169,38 @@ class PersonalizationServer:
         if not profile:
             return f"User {user_id} not found"
 
-        interests = [i.lower() for i in profile.get("interests", [])]
-        level = profile.get("experience_level", "beginner").lower()
+        interests, level = self._profile_norm[user_id]
         # Items the user has already interacted with
-        viewed = {item_id for (uid, _, item_id, _) in self.behaviour_history if uid == user_id}
-        scores = []
-        for item_id, meta in self.content_items.items():
-            if item_id in viewed:
-                continue
-            score = 0.0
-            # Match user interests to item tags
-            tag_matches = sum(1 for interest in interests if any(interest in tag.lower() for tag in meta["tags"]))
-            score += 0.4 * tag_matches
-            # Experience level match
-            if level in meta["tags"]:
-                score += 0.3
-            # Popularity boost
-            score += 0.2 * meta["popularity"]
-            # Context boost
-            if context.get("time_of_day") == "morning" and "beginner" in meta["tags"]:
-                score += 0.1
-            scores.append((score, item_id))
-        # Sort and build output
-        scores.sort(reverse=True, key=lambda x: x[0])
-        top = scores[:limit]
+        viewed = self._viewed.get(user_id, frozenset())
+        if _HAVE_NUMPY:
+            top = self._score_vectorized(interests, level, context, viewed, limit)
+        else:
+            # Union the posting lists once: item_id -> number of matching interests
+            tag_matches = Counter()
+            for interest in interests:
+                for item_id in self._tag_index.get(interest, ()):
+                    tag_matches[item_id] += 1
+            morning = context.get("time_of_day") == "morning"
+            scores = []
+            # Complement once instead of testing membership per item;
+            # empty when the user has already seen the whole catalog
+            for item_id in self._all_item_ids - viewed:
+                meta = self.content_items[item_id]
+                tags = self._tags_lower[item_id]
+                score = 0.0
+                # Match user interests to item tags
+                score += 0.4 * tag_matches[item_id]
+                # Experience level match
+                if level in tags:
+                    score += 0.3
+                # Popularity boost
+                score += 0.2 * meta["popularity"]
+                # Context boost
+                if morning and "beginner" in tags:
+                    score += 0.1
+                scores.append((score, item_id))
+            # Top-k selection in O(N log k); tuples order by score first
+            top = heapq.nlargest(limit, scores)
         if not top:
             return f"No new recommendations for {user_id}"
         lines = [f"Personalized recommendations for {user_id}:"]
@@ -90,7 +212,7 @@ class PersonalizationServer:
         lines.append("Based on:")
         lines.append(f"- Interests: {', '.join(profile['interests'])}")
         lines.append(f"- Experience level: {profile['experience_level']}")
-        lines.append(f"- Recent actions: {sum(1 for (uid, _, _, _) in self.behaviour_history if uid == user_id)}")
+        lines.append(f"- Recent actions: {self._action_counts[user_id]}")
         if context:
             lines.append(f"- Context: {context}")
         return "\n".join(lines)
@@ -105,7 +227,7 @@ if __name__ == "__main__":
         print(f"- {res['uri']}: {res['description']}")
     # Read content catalog
     print("\nContent catalog:")
-    print(server.read_resource("content://content_items"))
+    print(server.read_resource("content://content_items", pretty=True))
     # Get recommendations for a user with morning context
     print("\nRecommendations:")
     print(server.get_recommendations("user_001", context={"time_of_day": "morning"}, limit=3))
@@ -26,18 +26,33 @@ class MultimodalAnalyzer:
 
     def create_session(self, session_id: str, content_ids: List[str]) -> str:
         """Group multiple content items into a session."""
-        self.sessions[session_id] = {"contents": content_ids, "results": {}}
+        session = {"contents": content_ids, "results": {}}
+        # Contents are fixed once the session exists, so the synthesis is
+        # computed here and later calls return it directly
+        session["synthesis"] = self._synthesize(content_ids)
+        self.sessions[session_id] = session
         return f"Session {session_id} created with {len(content_ids)} items."
 
+    def _synthesize(self, content_ids: List[str]) -> Dict:
+        """Aggregate analysis results for a list of content ids."""
+        results = []
+        conf_sum = 0.0
+        conf_count = 0
+        for cid in content_ids:
+            result = self.content_database.get(cid, {})
+            results.append(result)
+            if "confidence" in result:
+                conf_sum += result["confidence"]
+                conf_count += 1
+        avg_conf = conf_sum / conf_count if conf_count else 0.0
+        return {"average_confidence": avg_conf, "results": results}
+
     def synthesize_insights(self, session_id: str) -> Dict:
         """Combine results from multiple items to produce aggregate insights."""
         session = self.sessions.get(session_id)
         if not session:
             return {"error": "Session not found"}
-        results = [self.content_database.get(cid, {}) for cid in session["contents"]]
-        confidences = [r.get("confidence") for r in results if "confidence" in r]
-        avg_conf = sum(confidences) / len(confidences) if confidences else 0.0
-        return {"average_confidence": avg_conf, "results": results}
+        return session["synthesis"]
 
 # Example usage
 if __name__ == "__main__":
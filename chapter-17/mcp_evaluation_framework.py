@@ -1,13 +1,38 @@
 import asyncio
+import heapq
+import math
+import random
 import time
 import json
 import statistics
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 import sqlite3
 
-@dataclass
+# Stored metrics/errors are machine-read, so they are serialized
+# compactly; orjson is used when installed, stdlib json otherwise.
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+# Simulated topology, frozen at module level so the enumeration helpers
+# don't rebuild dict and list literals on every call
+_KNOWN_SERVERS = ("document_server", "analysis_server", "knowledge_server")
+_CAPABILITIES: Dict[str, Tuple[str, ...]] = {
+    "document_server": ("search", "retrieve", "index"),
+    "analysis_server": ("analyze", "summarize", "classify"),
+    "knowledge_server": ("query", "reason", "explain"),
+    "dynamic_analysis_server": ("advanced_analysis", "pattern_recognition"),
+}
+
+@dataclass(slots=True, frozen=True)
 class EvaluationResult:
     """Container for evaluation results."""
     test_name: str
@@ -23,13 +48,20 @@ class MCPEvaluationFramework:
     def __init__(self, db_path: str = "mcp_evaluation.db"):
         self.db_path = db_path
         self.results = []
+        # Result rows are buffered here and flushed in one batch per
+        # session instead of paying a connect + commit per insert
+        self._pending_results = []
         self._setup_database()
-    
+
     def _setup_database(self):
         """Initialize evaluation results database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        # One long-lived connection; WAL + NORMAL sync so a session's
+        # batch flush costs a single fsync instead of one per row
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        cursor = self._conn.cursor()
+
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS evaluation_results (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -39,10 +71,20 @@ class MCPEvaluationFramework:
                 duration REAL,
                 metrics TEXT,
                 errors TEXT,
-                timestamp TEXT
+                timestamp TEXT,
+                response_time_mean REAL,
+                response_time_p95 REAL,
+                throughput_rps REAL
             )
         ''')
-        
+
+        # Dashboards filter by test and time range; the typed columns
+        # above let those queries aggregate without parsing the JSON blob
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_results_test_time
+            ON evaluation_results(test_name, timestamp)
+        ''')
+
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS evaluation_sessions (
                 session_id TEXT PRIMARY KEY,
@@ -55,14 +97,37 @@ class MCPEvaluationFramework:
             )
         ''')
         
-        conn.commit()
-        conn.close()
+        self._conn.commit()
         print("Evaluation framework database initialized")
 
+    def close(self):
+        """Flush any pending rows and close the database connection."""
+        self._conn.commit()
+        self._conn.close()
+
+    @staticmethod
+    def _running_stats(samples) -> Tuple[float, float]:
+        """Single-pass Welford mean and sample standard deviation."""
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        for x in samples:
+            n += 1
+            delta = x - mean
+            mean += delta / n
+            m2 += delta * (x - mean)
+        return mean, math.sqrt(m2 / (n - 1)) if n > 1 else 0.0
+
+    async def _timed_request(self, request_id: str) -> float:
+        """Issue one simulated request and return its wall time in seconds."""
+        start_ns = time.perf_counter_ns()
+        await self._simulate_mcp_request(request_id)
+        return (time.perf_counter_ns() - start_ns) / 1e9
+
     async def evaluate_capability_discovery(self, mcp_client_simulator) -> EvaluationResult:
         """Evaluate MCP capability discovery functionality."""
         test_name = "capability_discovery"
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         errors = []
         metrics = {}
         
@@ -108,7 +173,7 @@ class MCPEvaluationFramework:
             errors.append(f"Capability discovery test failed: {str(e)}")
             success = False
         
-        duration = time.time() - start_time
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
         
         return EvaluationResult(
             test_name=test_name,
@@ -122,29 +187,31 @@ class MCPEvaluationFramework:
     async def evaluate_performance_characteristics(self) -> EvaluationResult:
         """Evaluate MCP system performance characteristics."""
         test_name = "performance_characteristics"
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         errors = []
         metrics = {}
         
         try:
             print("Testing performance characteristics...")
             
-            # Test 1: Response time distribution
-            response_times = []
-            for i in range(50):
-                request_start = time.time()
-                await self._simulate_mcp_request(f"test_request_{i}")
-                response_time = time.time() - request_start
-                response_times.append(response_time)
-            
-            metrics["response_time_mean"] = statistics.mean(response_times)
+            # Test 1: Response time distribution - the 50 samples are
+            # independent, so they run concurrently; each is timed on its own
+            response_times = await asyncio.gather(
+                *(self._timed_request(f"test_request_{i}") for i in range(50))
+            )
+
+            # Mean and stdev in one Welford pass; p95 selects only the
+            # top-5% tail instead of sorting all samples
+            mean, std = self._running_stats(response_times)
+            metrics["response_time_mean"] = mean
             metrics["response_time_median"] = statistics.median(response_times)
-            metrics["response_time_std"] = statistics.stdev(response_times)
-            metrics["response_time_p95"] = sorted(response_times)[int(0.95 * len(response_times))]
+            metrics["response_time_std"] = std
+            tail = heapq.nlargest(math.ceil(0.05 * len(response_times)), response_times)
+            metrics["response_time_p95"] = tail[-1]
             
             # Test 2: Throughput under load
             concurrent_requests = 10
-            batch_start = time.time()
+            batch_start_ns = time.perf_counter_ns()
             
             tasks = []
             for i in range(concurrent_requests):
@@ -152,30 +219,31 @@ class MCPEvaluationFramework:
                 tasks.append(task)
             
             await asyncio.gather(*tasks)
-            batch_duration = time.time() - batch_start
+            batch_duration = (time.perf_counter_ns() - batch_start_ns) / 1e9
             
             metrics["concurrent_requests"] = concurrent_requests
             metrics["batch_duration"] = batch_duration
             metrics["throughput_rps"] = concurrent_requests / batch_duration
             
-            # Test 3: Scalability characteristics
-            scalability_results = []
-            for load_level in [1, 5, 10, 20]:
-                load_start = time.time()
-                load_tasks = []
-                for i in range(load_level):
-                    task = asyncio.create_task(self._simulate_mcp_request(f"scale_test_{load_level}_{i}"))
-                    load_tasks.append(task)
-                
-                await asyncio.gather(*load_tasks)
-                load_duration = time.time() - load_start
-                
-                scalability_results.append({
+            # Test 3: Scalability characteristics - each sweep times its
+            # own gather, so the four load levels can run side by side
+            async def sweep(load_level: int) -> Dict[str, Any]:
+                load_start_ns = time.perf_counter_ns()
+                await asyncio.gather(
+                    *(self._simulate_mcp_request(f"scale_test_{load_level}_{i}")
+                      for i in range(load_level))
+                )
+                load_duration = (time.perf_counter_ns() - load_start_ns) / 1e9
+                return {
                     "load_level": load_level,
                     "duration": load_duration,
                     "throughput": load_level / load_duration
-                })
-            
+                }
+
+            scalability_results = list(await asyncio.gather(
+                *(sweep(load_level) for load_level in (1, 5, 10, 20))
+            ))
+
             metrics["scalability_results"] = scalability_results
             
             success = (
@@ -188,7 +256,7 @@ class MCPEvaluationFramework:
             errors.append(f"Performance evaluation failed: {str(e)}")
             success = False
         
-        duration = time.time() - start_time
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
         
         return EvaluationResult(
             test_name=test_name,
@@ -202,7 +270,7 @@ class MCPEvaluationFramework:
     async def evaluate_reliability_and_error_handling(self) -> EvaluationResult:
         """Evaluate MCP system reliability and error handling."""
         test_name = "reliability_and_error_handling"
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         errors = []
         metrics = {}
         
@@ -243,7 +311,7 @@ class MCPEvaluationFramework:
             errors.append(f"Reliability evaluation failed: {str(e)}")
             success = False
         
-        duration = time.time() - start_time
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
         
         return EvaluationResult(
             test_name=test_name,
@@ -257,23 +325,21 @@ class MCPEvaluationFramework:
     async def evaluate_user_experience(self) -> EvaluationResult:
         """Evaluate MCP system user experience characteristics."""
         test_name = "user_experience"
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         errors = []
         metrics = {}
         
         try:
             print("Testing user experience...")
             
-            # Test 1: Response clarity
-            response_times = []
-            for i in range(20):
-                request_start = time.time()
-                await self._simulate_mcp_request(f"ux_test_{i}")
-                response_time = time.time() - request_start
-                response_times.append(response_time)
-            
-            metrics["average_response_time"] = statistics.mean(response_times)
-            metrics["response_consistency"] = 1.0 - (statistics.stdev(response_times) / statistics.mean(response_times)) if response_times else 0
+            # Test 1: Response clarity - sample the 20 requests concurrently
+            response_times = await asyncio.gather(
+                *(self._timed_request(f"ux_test_{i}") for i in range(20))
+            )
+
+            mean, std = self._running_stats(response_times)
+            metrics["average_response_time"] = mean
+            metrics["response_consistency"] = 1.0 - (std / mean) if response_times else 0
             
             # Test 2: Discovery usability
             servers = await self._simulate_server_discovery()
@@ -289,7 +355,7 @@ class MCPEvaluationFramework:
             errors.append(f"User experience evaluation failed: {str(e)}")
             success = False
         
-        duration = time.time() - start_time
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
         
         return EvaluationResult(
             test_name=test_name,
@@ -308,20 +374,18 @@ class MCPEvaluationFramework:
         print(f"Starting comprehensive MCP evaluation session: {session_id}")
         print("=" * 60)
         
-        # Run all evaluation tests
-        evaluation_tests = [
+        # Run all evaluation tests concurrently - they only await
+        # simulated I/O, so the session takes as long as the slowest test
+        results = list(await asyncio.gather(
             self.evaluate_capability_discovery(None),
             self.evaluate_performance_characteristics(),
             self.evaluate_reliability_and_error_handling(),
             self.evaluate_user_experience()
-        ]
-        
-        results = []
-        for test in evaluation_tests:
-            result = await test
-            results.append(result)
+        ))
+
+        for result in results:
             self._store_result(result, session_id)
-            
+
             print(f"\n{result.test_name}: {'PASS' if result.success else 'FAIL'}")
             print(f"Duration: {result.duration:.2f}s")
             if result.errors:
@@ -337,11 +401,12 @@ class MCPEvaluationFramework:
         summary_metrics = {
             "total_duration": (end_time - start_time).total_seconds(),
             "pass_rate": passed_tests / total_tests,
-            "average_test_duration": statistics.mean([r.duration for r in results]),
+            "average_test_duration": statistics.fmean(r.duration for r in results),
             "total_errors": sum(len(r.errors) for r in results)
         }
         
-        self._store_session_summary(session_id, start_time, end_time, 
+        # One transaction persists the whole session: result rows + summary
+        self._store_session_summary(session_id, start_time, end_time,
                                    total_tests, passed_tests, failed_tests, summary_metrics)
         
         print("\n" + "=" * 60)
@@ -359,59 +424,77 @@ class MCPEvaluationFramework:
     
     async def _simulate_server_discovery(self) -> List[str]:
         await asyncio.sleep(0.1)
-        return ["document_server", "analysis_server", "knowledge_server"]
-    
-    async def _simulate_capability_enumeration(self, server: str) -> List[str]:
-        await asyncio.sleep(0.05)
-        capabilities_map = {
-            "document_server": ["search", "retrieve", "index"],
-            "analysis_server": ["analyze", "summarize", "classify"],
-            "knowledge_server": ["query", "reason", "explain"],
-            "dynamic_analysis_server": ["advanced_analysis", "pattern_recognition"]
-        }
-        if server in capabilities_map:
-            return capabilities_map[server]
-        else:
+        # list() because evaluate_capability_discovery appends to the result
+        return list(_KNOWN_SERVERS)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _caps_for(server: str) -> Tuple[str, ...]:
+        """Resolve a server's capability tuple, or raise if unknown."""
+        capabilities = _CAPABILITIES.get(server)
+        if capabilities is None:
             raise Exception(f"Server {server} not available")
+        return capabilities
+
+    async def _simulate_capability_enumeration(self, server: str) -> Tuple[str, ...]:
+        # The sleep simulates network latency; the lookup behind it is
+        # memoized so repeat enumerations cost only the sleep
+        capabilities = self._caps_for(server)
+        await asyncio.sleep(0.05)
+        return capabilities
     
+    # Precomputed jitter table: picking a delay is an index lookup
+    # rather than hashing the request id string on every call
+    _JITTER = tuple(0.05 + i / 1000 for i in range(100))
+
     async def _simulate_mcp_request(self, request_id: str) -> Dict[str, Any]:
-        delay = 0.05 + (hash(request_id) % 100) / 1000
+        delay = random.choice(self._JITTER)
         await asyncio.sleep(delay)
         return {"request_id": request_id, "status": "success", "response_time": delay}
     
     def _store_result(self, result: EvaluationResult, session_id: str):
-        """Store evaluation result in database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO evaluation_results (test_name, test_category, success, duration, metrics, errors, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (result.test_name, session_id, result.success, result.duration,
-              json.dumps(result.metrics), json.dumps(result.errors), result.timestamp))
-        conn.commit()
-        conn.close()
-    
+        """Buffer an evaluation result for the next batch flush."""
+        # Hot metrics are lifted into typed columns; the full JSON blob
+        # stays alongside for anything not normalized yet
+        metrics = result.metrics
+        self._pending_results.append(
+            (result.test_name, session_id, result.success, result.duration,
+             _dumps(metrics), _dumps(result.errors), result.timestamp,
+             metrics.get("response_time_mean"),
+             metrics.get("response_time_p95"),
+             metrics.get("throughput_rps"))
+        )
+
     def _store_session_summary(self, session_id: str, start_time: datetime, end_time: datetime,
-                              total_tests: int, passed_tests: int, failed_tests: int, 
+                              total_tests: int, passed_tests: int, failed_tests: int,
                               summary_metrics: Dict[str, Any]):
-        """Store evaluation session summary."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO evaluation_sessions (session_id, start_time, end_time, total_tests, 
-                                           passed_tests, failed_tests, summary_metrics)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (session_id, start_time.isoformat(), end_time.isoformat(),
-              total_tests, passed_tests, failed_tests, json.dumps(summary_metrics)))
-        conn.commit()
-        conn.close()
+        """Flush buffered results and the session summary in one transaction."""
+        # with conn: begins a transaction and commits on exit (rolls back
+        # on exception), so the session lands atomically with one fsync
+        with self._conn:
+            if self._pending_results:
+                self._conn.executemany('''
+                    INSERT INTO evaluation_results (test_name, test_category, success, duration, metrics, errors, timestamp,
+                                                    response_time_mean, response_time_p95, throughput_rps)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', self._pending_results)
+            self._conn.execute('''
+                INSERT INTO evaluation_sessions (session_id, start_time, end_time, total_tests,
+                                               passed_tests, failed_tests, summary_metrics)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (session_id, start_time.isoformat(), end_time.isoformat(),
+                  total_tests, passed_tests, failed_tests, _dumps(summary_metrics)))
+        self._pending_results.clear()
 
 # Example usage
 async def main():
     """Demonstrate the MCP evaluation framework."""
     evaluator = MCPEvaluationFramework()
-    results = await evaluator.run_comprehensive_evaluation()
-    
+    try:
+        results = await evaluator.run_comprehensive_evaluation()
+    finally:
+        evaluator.close()
+
     print(f"\nEvaluation completed successfully!")
     print(f"Session ID: {results['session_id']}")
     print(f"Overall pass rate: {results['summary']['pass_rate']:.1%}")
@@ -12,11 +12,43 @@ import time
 import json
 import statistics
 import random
+from collections import defaultdict
 from datetime import datetime
 from typing import List, Dict, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import sqlite3
 
+# Metric aggregation vectorizes through NumPy when it is installed; the
+# stdlib fallback keeps the suite dependency-free.
+try:
+    import numpy as np
+    _HAVE_NUMPY = True
+except ImportError:
+    _HAVE_NUMPY = False
+
+
+def _mean_p95(samples) -> tuple:
+    """Mean and 95th percentile of a latency sample."""
+    if _HAVE_NUMPY:
+        arr = np.asarray(samples, dtype=np.float64)
+        k = int(0.95 * arr.size)
+        # partition is O(n) selection; no full sort
+        return float(arr.mean()), float(np.partition(arr, k)[k])
+    k = int(0.95 * len(samples))
+    return statistics.fmean(samples), sorted(samples)[k]
+
+
+# Serialization sits between awaits on the storage path; orjson is used
+# when installed, with compact stdlib json as the fallback.
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
 
 # ---------------------------------------------------------------------------
 # Part 1: Data model and benchmark suite setup
@@ -32,6 +64,14 @@ class BenchmarkResult:
     metadata: Dict[str, Any]
     timestamp: str
     duration: float
+    # Serialized once at construction so the batch insert binds
+    # ready-made strings instead of re-encoding inside the transaction
+    metrics_json: str = field(init=False, repr=False)
+    metadata_json: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.metrics_json = _dumps(self.metrics)
+        self.metadata_json = _dumps(self.metadata)
 
 
 class MCPBenchmarkSuite:
@@ -40,62 +80,105 @@ class MCPBenchmarkSuite:
     def __init__(self, db_path: str = "mcp_benchmarks.db"):
         self.db_path = db_path
         self.results: List[BenchmarkResult] = []
+        # With NumPy installed, a whole measurement batch's jitter comes
+        # from one vectorized draw instead of per-iteration random calls
+        self._np_rng = np.random.default_rng() if _HAVE_NUMPY else None
         self._setup_database()
 
+    def _uniform(self, n: int) -> List[float]:
+        """Batch of n uniform [0, 1) draws."""
+        if self._np_rng is not None:
+            return self._np_rng.random(n).tolist()
+        return [random.random() for _ in range(n)]
+
     # -- database -----------------------------------------------------------
 
     def _setup_database(self):
         """Create tables for persisting benchmark results."""
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-        cur.execute(
+        # Single connection for the suite's lifetime - no per-write
+        # connect/close overhead
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # One script for the whole schema: a single parse/dispatch for
+        # the DDL, and indexes to back the historical comparisons the
+        # module docstring promises
+        self._conn.executescript(
             """CREATE TABLE IF NOT EXISTS benchmark_results (
                    id INTEGER PRIMARY KEY AUTOINCREMENT,
                    benchmark_name TEXT, metrics TEXT, metadata TEXT,
-                   timestamp TEXT, duration REAL)"""
-        )
-        cur.execute(
-            """CREATE TABLE IF NOT EXISTS benchmark_sessions (
+                   timestamp TEXT, duration REAL);
+               CREATE TABLE IF NOT EXISTS benchmark_sessions (
                    session_id TEXT PRIMARY KEY, start_time TEXT,
                    end_time TEXT, total_benchmarks INTEGER,
-                   summary_metrics TEXT)"""
+                   summary_metrics TEXT);
+               CREATE INDEX IF NOT EXISTS idx_results_name
+                   ON benchmark_results(benchmark_name);
+               CREATE INDEX IF NOT EXISTS idx_results_ts
+                   ON benchmark_results(timestamp);"""
         )
-        conn.commit()
-        conn.close()
+        # WAL + NORMAL sync: the whole-session batch insert below costs
+        # one fsync instead of one per row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.commit()
         print("Benchmark database initialized")
 
-    def _store_result(self, result: BenchmarkResult, session_id: str):
-        """Persist a single benchmark result."""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute(
-            "INSERT INTO benchmark_results "
-            "(benchmark_name,metrics,metadata,timestamp,duration) "
-            "VALUES (?,?,?,?,?)",
-            (result.benchmark_name, json.dumps(result.metrics),
-             json.dumps(result.metadata), result.timestamp, result.duration),
-        )
-        conn.commit()
-        conn.close()
-
-    def _store_session(self, session_id, start, end, count, summary):
-        conn = sqlite3.connect(self.db_path)
-        conn.execute(
-            "INSERT INTO benchmark_sessions VALUES (?,?,?,?,?)",
-            (session_id, start.isoformat(), end.isoformat(),
-             count, json.dumps(summary)),
-        )
-        conn.commit()
-        conn.close()
+    def close(self):
+        """Close the suite's database connection."""
+        self._conn.close()
+
+    def _store_session_batch(self, results: List[BenchmarkResult],
+                             session_id: str, start, end, summary):
+        """Persist all of a session's results plus its summary in one batch."""
+        rows = [(r.benchmark_name, r.metrics_json,
+                 r.metadata_json, r.timestamp, r.duration)
+                for r in results]
+        # with conn: wraps both inserts in a single transaction
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO benchmark_results "
+                "(benchmark_name,metrics,metadata,timestamp,duration) "
+                "VALUES (?,?,?,?,?)", rows)
+            self._conn.execute(
+                "INSERT INTO benchmark_sessions VALUES (?,?,?,?,?)",
+                (session_id, start.isoformat(), end.isoformat(),
+                 len(results), _dumps(summary)))
+
+    # -- concurrency helper -------------------------------------------------
+
+    async def _bounded_gather(self, coro_factory, n: int,
+                              concurrency: int = 16) -> List[Any]:
+        """Run *n* calls of *coro_factory* with a cap on in-flight tasks.
+
+        Unbounded gather collapses once downstream connection limits bite;
+        a semaphore keeps at most *concurrency* requests in flight.
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def guarded():
+            async with sem:
+                return await coro_factory()
+
+        return await asyncio.gather(*(guarded() for _ in range(n)),
+                                    return_exceptions=True)
 
     # -- simulators (stand-ins for real MCP calls) --------------------------
 
-    async def _sim_server_discovery(self) -> List[str]:
-        await asyncio.sleep(0.02 + random.random() * 0.03)
+    # Each simulator takes optional pre-drawn uniforms so benchmarks can
+    # batch their randomness; None falls back to a per-call draw.
+
+    async def _sim_server_discovery(self, u: float = None) -> List[str]:
+        if u is None:
+            u = random.random()
+        await asyncio.sleep(0.02 + u * 0.03)
         return ["file_server", "search_server", "analytics_server",
                 "knowledge_server", "transform_server"]
 
-    async def _sim_capability_enum(self, server: str) -> List[str]:
-        await asyncio.sleep(0.01 + random.random() * 0.02)
+    async def _sim_capability_enum(self, server: str,
+                                   u: float = None) -> List[str]:
+        if u is None:
+            u = random.random()
+        await asyncio.sleep(0.01 + u * 0.02)
         cap_map = {
             "file_server": ["read", "write", "list"],
             "search_server": ["search", "index", "rank"],
@@ -105,28 +188,47 @@ class MCPBenchmarkSuite:
         }
         return cap_map.get(server, ["basic"])
 
-    async def _sim_coordination(self, servers: List[str]) -> float:
-        t = 0.02 * len(servers) + random.random() * 0.01
+    async def _sim_coordination(self, servers: List[str],
+                                u: float = None) -> float:
+        if u is None:
+            u = random.random()
+        t = 0.02 * len(servers) + u * 0.01
         await asyncio.sleep(t)
         return t
 
-    async def _sim_workflow(self, servers: List[str]) -> bool:
+    async def _sim_workflow(self, servers: List[str], u: float = None,
+                            fail_u: float = None) -> bool:
+        if u is None:
+            u = random.random()
         t = 0.03 * len(servers) ** 1.2
-        await asyncio.sleep(t + random.random() * 0.02)
-        if len(servers) > 3 and random.random() < 0.1:
-            raise RuntimeError("coordination timeout")
+        await asyncio.sleep(t + u * 0.02)
+        if len(servers) > 3:
+            if fail_u is None:
+                fail_u = random.random()
+            if fail_u < 0.1:
+                raise RuntimeError("coordination timeout")
         return True
 
-    async def _sim_user_request(self) -> float:
-        t = 0.05 + random.random() * 0.1
+    async def _sim_user_request(self, u: float = None,
+                                fail_u: float = None) -> float:
+        if u is None:
+            u = random.random()
+        t = 0.05 + u * 0.1
         await asyncio.sleep(t)
-        if random.random() < 0.05:
+        if fail_u is None:
+            fail_u = random.random()
+        if fail_u < 0.05:
             raise RuntimeError("request failed")
         return t
 
-    async def _sim_scenario(self, steps: int, complexity: float) -> bool:
-        await asyncio.sleep(steps * 0.02 * complexity + random.random() * 0.03)
-        return random.random() > (0.02 * complexity)
+    async def _sim_scenario(self, steps: int, complexity: float,
+                            u: float = None, fail_u: float = None) -> bool:
+        if u is None:
+            u = random.random()
+        await asyncio.sleep(steps * 0.02 * complexity + u * 0.03)
+        if fail_u is None:
+            fail_u = random.random()
+        return fail_u > (0.02 * complexity)
 
     # -----------------------------------------------------------------------
     # Part 2: Capability discovery and coordination benchmarks
@@ -137,74 +239,90 @@ class MCPBenchmarkSuite:
     async def benchmark_capability_discovery(self) -> BenchmarkResult:
         """Measure discovery latency, enumeration throughput, and reliability."""
         print("Running capability discovery benchmark...")
-        t0 = time.time()
-
-        # 1. Discovery latency (20 iterations)
-        disc_times = []
-        for _ in range(20):
-            ts = time.time()
-            await self._sim_server_discovery()
-            disc_times.append(time.time() - ts)
-
-        # 2. Capability enumeration
-        enum_times, cap_counts = [], []
-        for srv in (await self._sim_server_discovery()):
-            ts = time.time()
-            caps = await self._sim_capability_enum(srv)
-            enum_times.append(time.time() - ts)
-            cap_counts.append(len(caps))
-
-        # 3. Concurrent discovery reliability
-        tasks = [asyncio.create_task(self._sim_server_discovery())
-                 for _ in range(15)]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        ok = sum(1 for r in results if not isinstance(r, Exception))
-
+        t0_ns = time.perf_counter_ns()
+
+        # 1. One concurrent pass of 20 self-timed discoveries covers
+        # latency sampling, reliability, and the server list for the
+        # enumeration stage - the old flow ran three separate stages
+        # (20 timed + 1 seed + 15 reliability probes)
+        async def timed_discovery(u: float):
+            ts = time.perf_counter_ns()
+            servers = await self._sim_server_discovery(u)
+            return time.perf_counter_ns() - ts, servers
+
+        outcomes = await asyncio.gather(
+            *(timed_discovery(u) for u in self._uniform(20)),
+            return_exceptions=True)
+        successes = [o for o in outcomes if not isinstance(o, Exception)]
+        disc_times = [t for t, _ in successes]
+        servers = successes[0][1] if successes else []
+        ok = len(successes)
+
+        # 2. Capability enumeration, one concurrent probe per server
+        async def timed_enum(srv: str, u: float):
+            ts = time.perf_counter_ns()
+            caps = await self._sim_capability_enum(srv, u)
+            return time.perf_counter_ns() - ts, len(caps)
+
+        probes = await asyncio.gather(
+            *(timed_enum(srv, u)
+              for srv, u in zip(servers, self._uniform(len(servers)))))
+        enum_times = [t for t, _ in probes]
+        cap_counts = [n for _, n in probes]
+
+        # Samples stay as exact ns ints until this final conversion
+        disc_mean, disc_p95 = _mean_p95(disc_times)
         metrics = {
-            "discovery_latency_mean": statistics.mean(disc_times),
-            "discovery_latency_p95": sorted(disc_times)[int(0.95 * len(disc_times))],
-            "enumeration_throughput": len(enum_times) / sum(enum_times),
-            "avg_capabilities_per_server": statistics.mean(cap_counts),
-            "concurrent_reliability": ok / 15,
+            "discovery_latency_mean": disc_mean * 1e-9,
+            "discovery_latency_p95": disc_p95 * 1e-9,
+            "enumeration_throughput": len(enum_times) / (sum(enum_times) * 1e-9),
+            "avg_capabilities_per_server": statistics.fmean(cap_counts),
+            "concurrent_reliability": ok / 20,
         }
         return BenchmarkResult("capability_discovery", metrics,
                                {"iterations": 20}, datetime.now().isoformat(),
-                               time.time() - t0)
+                               (time.perf_counter_ns() - t0_ns) * 1e-9)
 
     async def benchmark_coordination(self) -> BenchmarkResult:
         """Measure cross-component coordination overhead."""
         print("Running coordination benchmark...")
-        t0 = time.time()
+        t0_ns = time.perf_counter_ns()
 
-        # Simple coordination latency
-        coord_times = []
-        for _ in range(20):
-            ts = time.time()
-            await self._sim_coordination(["a", "b"])
-            coord_times.append(time.time() - ts)
+        # Simple coordination latency, 20 self-timed concurrent probes
+        async def timed_coord(u: float) -> int:
+            ts = time.perf_counter_ns()
+            await self._sim_coordination(["a", "b"], u)
+            return time.perf_counter_ns() - ts
+
+        coord_times = await asyncio.gather(
+            *(timed_coord(u) for u in self._uniform(20)))
+
+        # Complex workflow success rate; the 10 trials per workflow are
+        # independent and run as one batch
+        async def try_workflow(wf: List[str], u: float, fail_u: float) -> bool:
+            try:
+                return await self._sim_workflow(wf, u, fail_u)
+            except RuntimeError:
+                return False
 
-        # Complex workflow success rate
         workflows = [["a","b","c"], ["a","b","c","d"], ["x","y"]]
         wf_success = []
         for wf in workflows:
-            ok = 0
-            for _ in range(10):
-                try:
-                    await self._sim_workflow(wf)
-                    ok += 1
-                except RuntimeError:
-                    pass
-            wf_success.append(ok / 10)
+            outcomes = await asyncio.gather(
+                *(try_workflow(wf, u, fail_u)
+                  for u, fail_u in zip(self._uniform(10), self._uniform(10))))
+            wf_success.append(sum(outcomes) / 10)
 
+        coord_mean, coord_p95 = _mean_p95(coord_times)
         metrics = {
-            "coord_latency_mean": statistics.mean(coord_times),
-            "coord_latency_p95": sorted(coord_times)[int(0.95 * len(coord_times))],
-            "workflow_success_mean": statistics.mean(wf_success),
+            "coord_latency_mean": coord_mean * 1e-9,
+            "coord_latency_p95": coord_p95 * 1e-9,
+            "workflow_success_mean": statistics.fmean(wf_success),
             "workflow_success_min": min(wf_success),
         }
         return BenchmarkResult("coordination", metrics,
                                {"workflows": len(workflows)},
-                               datetime.now().isoformat(), time.time() - t0)
+                               datetime.now().isoformat(), (time.perf_counter_ns() - t0_ns) * 1e-9)
 
     # -----------------------------------------------------------------------
     # Part 3: Scalability and end-to-end benchmarks, plus the scoring helper
@@ -215,15 +333,15 @@ class MCPBenchmarkSuite:
     async def benchmark_scalability(self) -> BenchmarkResult:
         """Measure throughput and success rate under increasing concurrency."""
         print("Running scalability benchmark...")
-        t0 = time.time()
+        t0_ns = time.perf_counter_ns()
         scale_data = []
 
         for n_users in (1, 5, 10, 25, 50):
-            ts = time.time()
-            tasks = [asyncio.create_task(self._sim_user_request())
-                     for _ in range(n_users)]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            elapsed = time.time() - ts
+            draws = zip(self._uniform(n_users), self._uniform(n_users))
+            ts = time.perf_counter_ns()
+            results = await self._bounded_gather(
+                lambda: self._sim_user_request(*next(draws)), n_users)
+            elapsed = (time.perf_counter_ns() - ts) * 1e-9
             ok = sum(1 for r in results if not isinstance(r, Exception))
             scale_data.append({
                 "users": n_users, "success_rate": ok / n_users,
@@ -238,12 +356,12 @@ class MCPBenchmarkSuite:
         }
         return BenchmarkResult("scalability", metrics,
                                {"max_users": 50},
-                               datetime.now().isoformat(), time.time() - t0)
+                               datetime.now().isoformat(), (time.perf_counter_ns() - t0_ns) * 1e-9)
 
     async def benchmark_end_to_end(self) -> BenchmarkResult:
         """Run realistic multi-step scenarios and measure success/latency."""
         print("Running end-to-end benchmark...")
-        t0 = time.time()
+        t0_ns = time.perf_counter_ns()
 
         scenarios = [
             {"name": "doc_search",     "steps": 3, "cx": 1.0},
@@ -251,31 +369,42 @@ class MCPBenchmarkSuite:
             {"name": "simple_query",   "steps": 2, "cx": 1.0},
             {"name": "collab_analysis","steps": 5, "cx": 2.0},
         ]
-        scenario_metrics = []
-        for sc in scenarios:
-            times, successes = [], []
-            for _ in range(10):
-                ts = time.time()
-                ok = await self._sim_scenario(sc["steps"], sc["cx"])
-                times.append(time.time() - ts)
-                successes.append(ok)
-            scenario_metrics.append({
+        # All 4 x 10 trials are independent, so they run as one tagged
+        # gather and get bucketed by scenario afterwards
+        async def run_trial(sc: Dict[str, Any], u: float, fail_u: float):
+            ts = time.perf_counter_ns()
+            ok = await self._sim_scenario(sc["steps"], sc["cx"], u, fail_u)
+            return sc["name"], (time.perf_counter_ns() - ts) * 1e-9, ok
+
+        jobs = [(sc, u, fail_u)
+                for sc in scenarios
+                for u, fail_u in zip(self._uniform(10), self._uniform(10))]
+        trials = await asyncio.gather(
+            *(run_trial(sc, u, fail_u) for sc, u, fail_u in jobs))
+
+        buckets: Dict[str, List] = defaultdict(list)
+        for name, elapsed, ok in trials:
+            buckets[name].append((elapsed, ok))
+        scenario_metrics = [
+            {
                 "name": sc["name"],
-                "mean_time": statistics.mean(times),
-                "success_rate": sum(successes) / len(successes),
-            })
+                "mean_time": statistics.fmean(t for t, _ in buckets[sc["name"]]),
+                "success_rate": sum(ok for _, ok in buckets[sc["name"]]) / 10,
+            }
+            for sc in scenarios
+        ]
 
         metrics = {
-            "overall_success": statistics.mean(
+            "overall_success": statistics.fmean(
                 s["success_rate"] for s in scenario_metrics),
-            "avg_latency": statistics.mean(
+            "avg_latency": statistics.fmean(
                 s["mean_time"] for s in scenario_metrics),
             "worst_success": min(
                 s["success_rate"] for s in scenario_metrics),
         }
         return BenchmarkResult("end_to_end", metrics,
                                {"scenarios": len(scenarios)},
-                               datetime.now().isoformat(), time.time() - t0)
+                               datetime.now().isoformat(), (time.perf_counter_ns() - t0_ns) * 1e-9)
 
     # -- scoring helpers ----------------------------------------------------
 
@@ -307,7 +436,6 @@ class MCPBenchmarkSuite:
                      self.benchmark_end_to_end()):
             r = await coro
             results.append(r)
-            self._store_result(r, session_id)
             print(f"  {r.benchmark_name} completed in {r.duration:.2f}s")
 
         # Compute per-dimension scores (0-1 scale)
@@ -334,7 +462,7 @@ class MCPBenchmarkSuite:
         end = datetime.now()
         summary = {"scores": scores, "overall": overall,
                    "duration": (end - start).total_seconds()}
-        self._store_session(session_id, start, end, len(results), summary)
+        self._store_session_batch(results, session_id, start, end, summary)
 
         print("=" * 60)
         print(f"Session {session_id} finished - {summary['duration']:.1f}s")
@@ -352,7 +480,10 @@ class MCPBenchmarkSuite:
 
 async def main():
     suite = MCPBenchmarkSuite()
-    await suite.run_suite()
+    try:
+        await suite.run_suite()
+    finally:
+        suite.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -7,15 +7,56 @@ request orchestration, and continuous performance monitoring.
 """
 
 import asyncio
+import hashlib
 import time
 import json
+from array import array
 import statistics
 import random
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime
+from itertools import chain
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field
 import sqlite3
 
+# Percentile queries use NumPy's O(n) partition selection when it is
+# installed; the sorted-based fallback keeps the demo stdlib-only.
+try:
+    import numpy as np
+    _HAVE_NUMPY = True
+except ImportError:
+    _HAVE_NUMPY = False
+
+# With numba on top, the selection compiles to machine code - overkill
+# for the demo's 40-sample window, but the right shape for production
+# monitors queried at hundreds of Hz over windows of thousands.
+if _HAVE_NUMPY:
+    try:
+        from numba import njit
+
+        @njit(cache=True)
+        def _p95_select(arr):
+            k = int(0.95 * arr.size)
+            return np.partition(arr, k)[k]
+
+        _HAVE_NUMBA = True
+    except ImportError:
+        _HAVE_NUMBA = False
+else:
+    _HAVE_NUMBA = False
+
+# Cache keys are built on every get/put, so context serialization is the
+# hot path here; orjson is used when installed, stdlib json otherwise.
+try:
+    import orjson
+
+    def _dumps_sorted(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+except ImportError:
+    def _dumps_sorted(obj) -> bytes:
+        return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode()
+
 
 # ---------------------------------------------------------------------------
 # Part 1: Data model and context-aware cache
@@ -35,37 +76,60 @@ class OptimizationMetrics:
 
 
 class ContextAwareCache:
-    """Cache whose validity depends on user context (permissions, scope)."""
+    """Cache whose validity depends on user context (permissions, scope).
+
+    The backing dict grows to *max_size* entries and stays there, so its
+    hash-table rehashes (at 64/128/256 entries under CPython) happen only
+    during warm-up; a power-of-two-ish max_size wastes the least table
+    space once the cache is full.
+    """
 
     def __init__(self, max_size: int = 256):
         self.max_size = max_size
-        self._store: Dict[str, Any] = {}
-        self._access_order: List[str] = []
+        # One OrderedDict gives O(1) LRU moves and evictions; the old
+        # dict + access list paid an O(n) list.remove per hit
+        self._store: OrderedDict[bytes, Any] = OrderedDict()
+        # Serialized-context memo keyed by id(); each entry pins the
+        # context object so its id cannot be recycled while cached.
+        # Contexts are treated as immutable once used for lookups.
+        self._ctx_cache: OrderedDict[int, tuple] = OrderedDict()
         self.hits = 0
         self.misses = 0
 
-    def _make_key(self, query: str, context: Dict[str, Any]) -> str:
-        ctx_sig = json.dumps(context, sort_keys=True)
-        return f"{query}::{ctx_sig}"
+    def _context_sig(self, context: Dict[str, Any]) -> bytes:
+        cid = id(context)
+        entry = self._ctx_cache.get(cid)
+        if entry is None:
+            entry = (context, _dumps_sorted(context))
+            self._ctx_cache[cid] = entry
+            if len(self._ctx_cache) > 128:
+                self._ctx_cache.popitem(last=False)
+        return entry[1]
+
+    def _make_key(self, query: str, context: Dict[str, Any]) -> bytes:
+        # Fixed 16-byte digest: dict hashing and comparison touch the
+        # same few bytes no matter how large the query or context grows
+        return hashlib.blake2b(
+            query.encode() + b"::" + self._context_sig(context),
+            digest_size=16,
+        ).digest()
 
     def get(self, query: str, context: Dict[str, Any]) -> Optional[Any]:
         key = self._make_key(query, context)
-        if key in self._store:
+        value = self._store.get(key)
+        if value is not None:
             self.hits += 1
-            self._access_order.remove(key)
-            self._access_order.append(key)
-            return self._store[key]
+            self._store.move_to_end(key)
+            return value
         self.misses += 1
         return None
 
     def put(self, query: str, context: Dict[str, Any], value: Any):
         key = self._make_key(query, context)
-        if len(self._store) >= self.max_size and key not in self._store:
-            oldest = self._access_order.pop(0)
-            del self._store[oldest]
         self._store[key] = value
-        if key not in self._access_order:
-            self._access_order.append(key)
+        self._store.move_to_end(key)
+        if len(self._store) > self.max_size:
+            self._store.popitem(last=False)
 
     @property
     def hit_rate(self) -> float:
@@ -83,37 +147,47 @@ class CapabilityAwareLoadBalancer:
     """Routes requests to the server best suited by capability and load."""
 
     def __init__(self):
-        self.servers: Dict[str, Dict[str, Any]] = {}
+        # Structure-of-arrays: the selection path scans the load column
+        # as one contiguous array instead of hopping through a dict of
+        # per-server dicts
+        self._index: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._caps: List[frozenset] = []
+        self._loads = array("l")
+        self._total = array("l")
 
     def register_server(self, name: str, capabilities: List[str]):
-        self.servers[name] = {
-            "capabilities": set(capabilities),
-            "current_load": 0,
-            "total_handled": 0,
-        }
+        self._index[name] = len(self._names)
+        self._names.append(name)
+        # Frozen at registration: immutable, slightly smaller, and the
+        # subset test below stays on the tuned frozenset C path
+        self._caps.append(frozenset(capabilities))
+        self._loads.append(0)
+        self._total.append(0)
 
     def select_server(self, required_caps: List[str]) -> Optional[str]:
         """Pick the least-loaded server that has every required capability."""
-        candidates = []
-        for name, info in self.servers.items():
-            if set(required_caps).issubset(info["capabilities"]):
-                candidates.append((name, info["current_load"]))
-        if not candidates:
+        # One pass tracking the running minimum - no candidate list, no
+        # sort, and the requirement set is built once
+        req = frozenset(required_caps)
+        loads = self._loads
+        chosen, best_load = -1, float("inf")
+        for i, caps in enumerate(self._caps):
+            if req <= caps and loads[i] < best_load:
+                chosen, best_load = i, loads[i]
+        if chosen < 0:
             return None
-        candidates.sort(key=lambda c: c[1])
-        chosen = candidates[0][0]
-        self.servers[chosen]["current_load"] += 1
-        self.servers[chosen]["total_handled"] += 1
-        return chosen
+        loads[chosen] += 1
+        self._total[chosen] += 1
+        return self._names[chosen]
 
     def release(self, server_name: str):
-        if server_name in self.servers:
-            self.servers[server_name]["current_load"] = max(
-                0, self.servers[server_name]["current_load"] - 1
-            )
+        i = self._index.get(server_name)
+        if i is not None and self._loads[i] > 0:
+            self._loads[i] -= 1
 
     def load_distribution(self) -> Dict[str, int]:
-        return {n: s["total_handled"] for n, s in self.servers.items()}
+        return dict(zip(self._names, self._total))
 
 
 # ---------------------------------------------------------------------------
@@ -137,27 +211,35 @@ class RequestOrchestrator:
         *dag* maps task names to lists of dependency names.
         *execute_fn(task_name)* is an async callable that runs one task.
         """
-        completed: Dict[str, Any] = {}
-        remaining = dict(dag)
+        # Kahn's algorithm: in-degree counters plus a successor list give
+        # O(V + E) scheduling instead of rescanning every remaining task
+        # and its dependencies on each round
+        indeg = {t: len(deps) for t, deps in dag.items()}
+        successors: Dict[str, List[str]] = defaultdict(list)
+        for task, deps in dag.items():
+            for dep in deps:
+                successors[dep].append(task)
 
-        while remaining:
-            # Find tasks whose dependencies are all satisfied
-            ready = [
-                t for t, deps in remaining.items()
-                if all(d in completed for d in deps)
-            ]
-            if not ready:
-                raise RuntimeError("Cycle detected in task DAG")
+        completed: Dict[str, Any] = {}
+        ready = [t for t, d in indeg.items() if d == 0]
 
+        while ready:
             self.total_batches += 1
             batch_results = await asyncio.gather(
                 *(execute_fn(t) for t in ready)
             )
+            next_ready: List[str] = []
             for task, result in zip(ready, batch_results):
                 completed[task] = result
-                del remaining[task]
                 self.total_requests += 1
-
+                for succ in successors[task]:
+                    indeg[succ] -= 1
+                    if indeg[succ] == 0:
+                        next_ready.append(succ)
+            ready = next_ready
+
+        if len(completed) != len(dag):
+            raise RuntimeError("Cycle detected in task DAG")
         return completed
 
 
@@ -166,31 +248,54 @@ class PerformanceMonitor:
 
     def __init__(self, window: int = 50):
         self.window = window
-        self._samples: List[float] = []
+        # Samples live in two fixed windows with running sums, so the
+        # mean and the regression check are O(1) instead of rescans.
+        # Lengths are managed in record() (each capped at window) so the
+        # shifted sample can be subtracted from the right running sum;
+        # deque(maxlen=...) would discard it silently.
+        self._old: deque = deque()
+        self._new: deque = deque()
+        self._sum_old = 0.0
+        self._sum_new = 0.0
 
     def record(self, latency: float):
-        self._samples.append(latency)
-        if len(self._samples) > self.window * 2:
-            self._samples = self._samples[-self.window * 2:]
+        self._new.append(latency)
+        self._sum_new += latency
+        if len(self._new) > self.window:
+            shifted = self._new.popleft()
+            self._sum_new -= shifted
+            self._old.append(shifted)
+            self._sum_old += shifted
+            if len(self._old) > self.window:
+                self._sum_old -= self._old.popleft()
 
     @property
     def mean_latency(self) -> float:
-        return statistics.mean(self._samples) if self._samples else 0.0
+        count = len(self._old) + len(self._new)
+        return (self._sum_old + self._sum_new) / count if count else 0.0
 
     @property
     def p95_latency(self) -> float:
-        if not self._samples:
+        n = len(self._old) + len(self._new)
+        if not n:
             return 0.0
-        s = sorted(self._samples)
-        return s[int(0.95 * len(s))]
+        k = int(0.95 * n)
+        samples = chain(self._old, self._new)
+        if _HAVE_NUMPY:
+            # partition places the k-th smallest at index k in O(n)
+            arr = np.fromiter(samples, dtype=np.float64, count=n)
+            if _HAVE_NUMBA:
+                return float(_p95_select(arr))
+            return float(np.partition(arr, k)[k])
+        return sorted(samples)[k]
 
     def regression_detected(self) -> bool:
         """True when the recent window is >20 % slower than the prior one."""
-        if len(self._samples) < self.window * 2:
+        if len(self._old) < self.window:
             return False
-        old = self._samples[-self.window * 2:-self.window]
-        new = self._samples[-self.window:]
-        return statistics.mean(new) > statistics.mean(old) * 1.2
+        # Both windows hold exactly self.window samples here, so the
+        # means compare as plain sums
+        return self._sum_new > self._sum_old * 1.2
 
 
 # ---------------------------------------------------------------------------
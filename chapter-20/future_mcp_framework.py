@@ -1,12 +1,32 @@
 import asyncio
+import itertools
 import json
+import logging
 import time
 from datetime import datetime, timedelta
+from operator import attrgetter
 from typing import List, Dict, Any, Optional, Set
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+from collections import Counter, defaultdict, deque
 import sqlite3
 
+# DB payloads go through orjson when it is installed; the stdlib fallback
+# uses compact separators so both produce the same minimal JSON.
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+# Operational chatter goes through logging so callers control verbosity;
+# at WARNING and above these calls cost one level check and no formatting.
+# The demo's own report output stays on print.
+logger = logging.getLogger(__name__)
+
 class CapabilityType(Enum):
     """Types of AI capabilities that might emerge."""
     LANGUAGE_MODEL = "language_model"
@@ -29,23 +49,121 @@ class FutureCapability:
     dependencies: List[str]
     supported_modalities: List[str]
     specializations: List[str]
+    # Characteristics are fixed after construction, so the mean used for
+    # ranking and the JSON forms bound into the database are computed once
+    avg_performance: float = field(init=False)
+    _perf_json: str = field(init=False, repr=False)
+    _deps_json: str = field(init=False, repr=False)
+    _modalities_json: str = field(init=False, repr=False)
+    _specs_json: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.avg_performance = (
+            sum(self.performance_characteristics.values())
+            / len(self.performance_characteristics)
+        )
+        self._perf_json = _dumps(self.performance_characteristics)
+        self._deps_json = _dumps(self.dependencies)
+        self._modalities_json = _dumps(self.supported_modalities)
+        self._specs_json = _dumps(self.specializations)
+
+@dataclass(slots=True)
+class CollaborativeSession:
+    """Mutable state of one collaborative session.
+
+    Slots give one-op attribute access in the simulation loop and avoid
+    the per-instance dict a plain nested dict of session state carries.
+    """
+    session_id: str
+    session_type: str
+    participating_capabilities: List[str]
+    objectives: List[str]
+    start_time: str
+    status: str = "active"
+    interactions: List[Dict[str, Any]] = field(default_factory=list)
+    emergent_behaviors: List[Dict[str, Any]] = field(default_factory=list)
+    performance_metrics: Dict[str, Any] = field(default_factory=dict)
+    outcomes: Dict[str, Any] = field(default_factory=dict)
+    end_time: Optional[str] = None
+
+# Statement text as module constants: sqlite3 caches compiled statements
+# keyed on the SQL string, so passing the same string object every call
+# reuses the prepared plan instead of re-parsing the literal.
+SQL_INSERT_CAPABILITY = '''
+    INSERT OR REPLACE INTO future_capabilities
+    (id, name, capability_type, version, performance_characteristics,
+     dependencies, supported_modalities, specializations, registration_time)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+SQL_INSERT_SESSION = '''
+    INSERT INTO collaboration_sessions (session_id, participating_capabilities, session_type, start_time, outcomes)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+SQL_UPDATE_SESSION = '''
+    UPDATE collaboration_sessions
+    SET end_time = ?, outcomes = ?
+    WHERE session_id = ?
+'''
+
+SQL_INSERT_EMERGENT = '''
+    INSERT INTO emergent_behaviors
+    (session_id, behavior_description, participating_capabilities, emergence_conditions, performance_impact, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
 
 class FutureMCPFramework:
     """Framework demonstrating future MCP directions."""
     
-    def __init__(self, db_path: str = "future_mcp.db"):
+    def __init__(self, db_path: str = "future_mcp.db", persistence: str = "sqlite"):
+        """Create the framework.
+
+        persistence="memory" skips SQLite entirely: the demo only ever
+        reads session state back from the in-memory dicts, so transient
+        benchmark-style runs can drop the write overhead altogether.
+        """
+        if persistence not in ("sqlite", "memory"):
+            raise ValueError(f"Unknown persistence mode: {persistence}")
         self.db_path = db_path
+        self.persistence = persistence
         self.registered_capabilities = {}
         self.active_sessions = {}
         self.capability_graph = {}
-        self._setup_database()
+        # Inverted indexes: specialization/modality -> capability ids, so
+        # requirement matching is two dict lookups instead of a full scan
+        self._spec_index: Dict[str, Set[str]] = defaultdict(set)
+        self._modality_index: Dict[str, Set[str]] = defaultdict(set)
+        # Parallel columns over the registry, appended at registration, so
+        # trend analysis iterates flat lists instead of dereferencing each
+        # capability object's attributes
+        self._cap_types: List[str] = []
+        self._cap_modalities: List[List[str]] = []
+        self._cap_dep_counts: List[int] = []
+        self._session_counter = itertools.count()
+        # Discovery is deterministic for a given registry state, so results
+        # are memoized by requirement set; registration invalidates it
+        self._composition_cache: Dict[frozenset, List[Dict[str, Any]]] = {}
+        self._conn = None
+        if persistence == "sqlite":
+            self._setup_database()
         self._initialize_future_capabilities()
+        if self._conn is not None:
+            # Refresh planner statistics now that the seed rows are in place
+            self._conn.execute("ANALYZE")
     
     def _setup_database(self):
         """Initialize database for future MCP framework."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        # One long-lived connection: opening a fresh connection per write
+        # pays file-open and journal setup each time and throws away
+        # SQLite's page cache between statements.
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-64000")
+        cursor = self._conn.cursor()
+
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS future_capabilities (
                 id TEXT PRIMARY KEY,
@@ -82,10 +200,43 @@ class FutureMCPFramework:
                 timestamp TEXT
             )
         ''')
-        
-        conn.commit()
-        conn.close()
-        print("Future MCP framework database initialized")
+
+        # Secondary indexes for the lookup columns the tables are queried
+        # by; without them the session UPDATE and behavior retrievals scan.
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_eb_session ON emergent_behaviors(session_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_cap_type ON future_capabilities(capability_type)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_cs_type ON collaboration_sessions(session_type)')
+
+        self._conn.commit()
+        logger.info("Future MCP framework database initialized")
+
+    def close(self):
+        """Flush pending writes and close the shared database connection."""
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+
+    def _write(self, sql: str, params: tuple):
+        """Run one write statement in its own transaction (no-op in memory mode)."""
+        if self._conn is None:
+            return
+        with self._conn:
+            self._conn.execute(sql, params)
+
+    def _write_many(self, sql: str, rows: List[tuple]):
+        """Run a batch of writes in one transaction (no-op in memory mode)."""
+        if self._conn is None:
+            return
+        with self._conn:
+            self._conn.executemany(sql, rows)
+
+    async def _write_async(self, sql: str, params: tuple):
+        """Run a write in a worker thread so fsync never stalls the event loop.
+
+        The shared connection is created with check_same_thread=False, and
+        to_thread serializes access well enough for this demo's write rate.
+        """
+        await asyncio.to_thread(self._write, sql, params)
     
     def _initialize_future_capabilities(self):
         """Initialize example future capabilities."""
@@ -167,58 +318,70 @@ class FutureMCPFramework:
             )
         ]
         
+        # Register in memory first, then persist the whole batch in one
+        # transaction: one commit instead of one per capability.
         for capability in future_capabilities:
-            self.register_capability(capability)
-    
+            self._register_in_memory(capability)
+        self._persist_many(future_capabilities)
+
+    def _register_in_memory(self, capability: FutureCapability):
+        """Add a capability to the in-memory registry and lookup indexes."""
+        self.registered_capabilities[capability.id] = capability
+        for specialization in capability.specializations:
+            self._spec_index[specialization].add(capability.id)
+        for modality in capability.supported_modalities:
+            self._modality_index[modality].add(capability.id)
+        self._cap_types.append(capability.capability_type.value)
+        self._cap_modalities.append(capability.supported_modalities)
+        self._cap_dep_counts.append(len(capability.dependencies))
+        # New capabilities can change what compositions are possible
+        self._composition_cache.clear()
+        logger.info("Registered capability: %s", capability.name)
+
+    def _persist_many(self, capabilities: List[FutureCapability]):
+        """Write a batch of capabilities to the database in one transaction."""
+        registration_time = datetime.now().isoformat()
+        self._write_many(SQL_INSERT_CAPABILITY, [
+            (
+                capability.id,
+                capability.name,
+                capability.capability_type.value,
+                capability.version,
+                capability._perf_json,
+                capability._deps_json,
+                capability._modalities_json,
+                capability._specs_json,
+                registration_time
+            )
+            for capability in capabilities
+        ])
+
     def register_capability(self, capability: FutureCapability):
         """Register a new capability in the framework."""
-        self.registered_capabilities[capability.id] = capability
-        
-        # Store in database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO future_capabilities 
-            (id, name, capability_type, version, performance_characteristics, 
-             dependencies, supported_modalities, specializations, registration_time)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            capability.id,
-            capability.name,
-            capability.capability_type.value,
-            capability.version,
-            json.dumps(capability.performance_characteristics),
-            json.dumps(capability.dependencies),
-            json.dumps(capability.supported_modalities),
-            json.dumps(capability.specializations),
-            datetime.now().isoformat()
-        ))
-        
-        conn.commit()
-        conn.close()
-        
-        print(f"Registered capability: {capability.name}")
+        self._register_in_memory(capability)
+        self._persist_many([capability])
 
     async def discover_capability_compositions(self, required_capabilities: List[str]) -> List[Dict[str, Any]]:
         """Discover possible compositions of capabilities to meet requirements."""
         print(f"Discovering capability compositions for: {required_capabilities}")
-        
+
+        cache_key = frozenset(required_capabilities)
+        cached = self._composition_cache.get(cache_key)
+        if cached is not None:
+            # Served from memory: no discovery delay on repeat queries
+            print(f"Found {len(cached)} capability compositions (cached)")
+            return list(cached)
+
         compositions = []
         
-        # Find direct matches
+        # Find direct matches via the inverted indexes
         for req in required_capabilities:
-            matching_capabilities = []
-            for cap_id, capability in self.registered_capabilities.items():
-                if req in capability.specializations or req in capability.supported_modalities:
-                    matching_capabilities.append(capability)
-            
+            matching_ids = self._spec_index.get(req, set()) | self._modality_index.get(req, set())
+            matching_capabilities = [self.registered_capabilities[cap_id] for cap_id in matching_ids]
+
             if matching_capabilities:
-                # Sort by performance characteristics
-                matching_capabilities.sort(
-                    key=lambda c: sum(c.performance_characteristics.values()) / len(c.performance_characteristics),
-                    reverse=True
-                )
+                # Sort by precomputed average performance
+                matching_capabilities.sort(key=attrgetter("avg_performance"), reverse=True)
                 
                 compositions.append({
                     "requirement": req,
@@ -270,47 +433,36 @@ class FutureMCPFramework:
                 compositions.append(analysis_composition)
         
         await asyncio.sleep(0.1)  # Simulate discovery time
-        
+
+        self._composition_cache[cache_key] = compositions
         print(f"Found {len(compositions)} capability compositions")
-        return compositions
+        return list(compositions)
 
     async def create_collaborative_session(self, session_type: str, capabilities: List[str], 
                                          objectives: List[str]) -> str:
         """Create a collaborative session between multiple capabilities."""
-        session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{len(self.active_sessions)}"
-        
-        print(f"Creating collaborative session: {session_id}")
-        print(f"Session type: {session_type}")
-        print(f"Participating capabilities: {capabilities}")
-        print(f"Objectives: {objectives}")
-        
-        session_data = {
-            "session_id": session_id,
-            "session_type": session_type,
-            "participating_capabilities": capabilities,
-            "objectives": objectives,
-            "start_time": datetime.now().isoformat(),
-            "status": "active",
-            "interactions": [],
-            "emergent_behaviors": [],
-            "performance_metrics": {}
-        }
-        
+        # Nanosecond timestamp plus a monotonic counter: unique without the
+        # strftime formatting cost, and collision-free within one second
+        session_id = f"session_{time.time_ns()}_{next(self._session_counter)}"
+        
+        logger.info("Creating collaborative session %s (type=%s)", session_id, session_type)
+        logger.debug("Participating capabilities: %s; objectives: %s", capabilities, objectives)
+        
+        session_data = CollaborativeSession(
+            session_id=session_id,
+            session_type=session_type,
+            participating_capabilities=capabilities,
+            objectives=objectives,
+            start_time=datetime.now().isoformat()
+        )
+
         self.active_sessions[session_id] = session_data
         
         # Store in database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO collaboration_sessions (session_id, participating_capabilities, session_type, start_time, outcomes)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (session_id, json.dumps(capabilities), session_type, 
-              session_data["start_time"], json.dumps({"status": "active"})))
-        
-        conn.commit()
-        conn.close()
-        
+        await self._write_async(SQL_INSERT_SESSION,
+                                (session_id, _dumps(capabilities), session_type,
+                                 session_data.start_time, _dumps({"status": "active"})))
+
         return session_id
     
     async def simulate_collaborative_work(self, session_id: str, duration_minutes: int = 2) -> Dict[str, Any]:
@@ -319,62 +471,76 @@ class FutureMCPFramework:
             return {"error": "Session not found"}
         
         session = self.active_sessions[session_id]
-        print(f"Simulating collaborative work for session {session_id} ({duration_minutes} minutes)")
-        
-        start_time = time.time()
-        end_time = start_time + (duration_minutes * 60)
+        logger.info("Simulating collaborative work for session %s (%d minutes)",
+                    session_id, duration_minutes)
         
+        # Work per interval is constant, so the iteration count is known up
+        # front; polling time.time() against a deadline made the number of
+        # interactions drift with sleep overshoot
+        n_iterations = (duration_minutes * 60) // 5
+
         interactions = []
         emergent_behaviors = []
-        
+        # Running total and a bounded recent window, so neither the final
+        # average nor the per-emergence quality needs to rescan the list
+        eff_sum = 0.0
+        recent_effectiveness = deque(maxlen=3)
+        # Emergence impact totals accumulate as behaviors appear, so the
+        # outcome summary reads them instead of re-walking the list twice
+        total_novel_insights = 0
+        total_efficiency_gain = 0.0
+
+        # The participant list never changes mid-session, so its JSON form
+        # is serialized once here instead of per emergent behavior
+        participants_json = _dumps(session.participating_capabilities)
+
+        # The three interaction shapes cycle deterministically, so their
+        # fixed parts (type, participants, content stem, effectiveness curve)
+        # are built once and the loop just indexes into the table
+        participants_all = session.participating_capabilities
+        interaction_specs = (
+            ("information_sharing", participants_all[:2],
+             "Shared research findings and analysis results", 0.85, 0.02),
+            ("collaborative_reasoning", participants_all,
+             "Joint problem-solving and hypothesis refinement", 0.78, 0.03),
+            ("task_coordination", [participants_all[0]],  # Orchestrator
+             "Coordinated task allocation and progress monitoring", 0.82, 0.015),
+        )
+
         # Simulate collaborative interactions
-        interaction_count = 0
-        while time.time() < end_time:
+        for interaction_count in range(1, n_iterations + 1):
             await asyncio.sleep(5)  # Simulate work intervals
-            
-            interaction_count += 1
-            
-            # Simulate different types of interactions
-            if interaction_count % 3 == 1:
-                # Information sharing
-                interaction = {
-                    "type": "information_sharing",
-                    "timestamp": datetime.now().isoformat(),
-                    "participants": session["participating_capabilities"][:2],
-                    "content": f"Shared research findings and analysis results (iteration {interaction_count})",
-                    "effectiveness": 0.85 + (interaction_count * 0.02)  # Improving over time
-                }
-            elif interaction_count % 3 == 2:
-                # Collaborative reasoning
-                interaction = {
-                    "type": "collaborative_reasoning",
-                    "timestamp": datetime.now().isoformat(),
-                    "participants": session["participating_capabilities"],
-                    "content": f"Joint problem-solving and hypothesis refinement (iteration {interaction_count})",
-                    "effectiveness": 0.78 + (interaction_count * 0.03)
-                }
-            else:
-                # Task coordination
-                interaction = {
-                    "type": "task_coordination",
-                    "timestamp": datetime.now().isoformat(),
-                    "participants": [session["participating_capabilities"][0]],  # Orchestrator
-                    "content": f"Coordinated task allocation and progress monitoring (iteration {interaction_count})",
-                    "effectiveness": 0.82 + (interaction_count * 0.015)
-                }
-            
+
+            # One timestamp per iteration; the interaction and any emergent
+            # behavior it triggers share it
+            now_iso = datetime.now().isoformat()
+
+            # Simulate different types of interactions; effectiveness
+            # improves over time along each type's own curve
+            kind, participants, content_stem, base, slope = \
+                interaction_specs[(interaction_count - 1) % 3]
+            interaction = {
+                "type": kind,
+                "timestamp": now_iso,
+                "participants": participants,
+                "content": f"{content_stem} (iteration {interaction_count})",
+                "effectiveness": base + (interaction_count * slope)
+            }
+
             interactions.append(interaction)
-            
+            eff_sum += interaction["effectiveness"]
+            recent_effectiveness.append(interaction["effectiveness"])
+
             # Simulate emergent behaviors
             if interaction_count > 2 and interaction_count % 4 == 0:
                 emergent_behavior = {
                     "type": "emergent_insight",
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now_iso,
                     "description": f"Novel research approach discovered through capability interaction",
-                    "participating_capabilities": session["participating_capabilities"],
+                    "participating_capabilities": session.participating_capabilities,
                     "emergence_conditions": {
                         "interaction_count": interaction_count,
-                        "collaboration_quality": sum(i["effectiveness"] for i in interactions[-3:]) / 3
+                        "collaboration_quality": sum(recent_effectiveness) / len(recent_effectiveness)
                     },
                     "impact": {
                         "research_quality_improvement": 0.15,
@@ -383,12 +549,16 @@ class FutureMCPFramework:
                     }
                 }
                 emergent_behaviors.append(emergent_behavior)
-                
-                # Store emergent behavior
-                self._store_emergent_behavior(session_id, emergent_behavior)
+                total_novel_insights += emergent_behavior["impact"]["novel_insights"]
+                total_efficiency_gain += emergent_behavior["impact"]["efficiency_gain"]
         
+        # Persist all emergent behaviors in one transaction rather than one
+        # commit per emergence inside the loop
+        await self._store_emergent_behaviors_batch(session_id, emergent_behaviors,
+                                                   participants_json)
+
         # Calculate session outcomes
-        avg_effectiveness = sum(i["effectiveness"] for i in interactions) / len(interactions) if interactions else 0
+        avg_effectiveness = eff_sum / len(interactions) if interactions else 0
         
         outcomes = {
             "session_duration": duration_minutes,
@@ -396,37 +566,29 @@ class FutureMCPFramework:
             "emergent_behaviors": len(emergent_behaviors),
             "average_effectiveness": avg_effectiveness,
             "collaboration_quality": min(1.0, avg_effectiveness * 1.1),
-            "novel_insights_generated": sum(eb["impact"]["novel_insights"] for eb in emergent_behaviors),
-            "efficiency_improvements": sum(eb["impact"]["efficiency_gain"] for eb in emergent_behaviors),
+            "novel_insights_generated": total_novel_insights,
+            "efficiency_improvements": total_efficiency_gain,
             "final_status": "completed_successfully"
         }
         
         # Update session
-        session["interactions"] = interactions
-        session["emergent_behaviors"] = emergent_behaviors
-        session["end_time"] = datetime.now().isoformat()
-        session["status"] = "completed"
-        session["outcomes"] = outcomes
+        session.interactions = interactions
+        session.emergent_behaviors = emergent_behaviors
+        session.end_time = datetime.now().isoformat()
+        session.status = "completed"
+        session.outcomes = outcomes
         
         # Update database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE collaboration_sessions 
-            SET end_time = ?, outcomes = ?
-            WHERE session_id = ?
-        ''', (session["end_time"], json.dumps(outcomes), session_id))
-        
-        conn.commit()
-        conn.close()
-        
-        print(f"Collaborative session completed:")
-        print(f"  Interactions: {outcomes['total_interactions']}")
-        print(f"  Emergent behaviors: {outcomes['emergent_behaviors']}")
-        print(f"  Average effectiveness: {outcomes['average_effectiveness']:.2f}")
-        print(f"  Novel insights: {outcomes['novel_insights_generated']}")
-        
+        await self._write_async(SQL_UPDATE_SESSION,
+                                (session.end_time, _dumps(outcomes), session_id))
+
+        logger.info(
+            "Collaborative session completed: %d interactions, %d emergent behaviors, "
+            "average effectiveness %.2f, %d novel insights",
+            outcomes["total_interactions"], outcomes["emergent_behaviors"],
+            outcomes["average_effectiveness"], outcomes["novel_insights_generated"]
+        )
+
         return outcomes
 
     async def analyze_future_trends(self) -> Dict[str, Any]:
@@ -434,25 +596,20 @@ class FutureMCPFramework:
         print("Analyzing future trends in MCP and AI collaboration...")
         
         # Analyze registered capabilities
+        # The registry columns maintained at registration time make this a
+        # few passes over flat lists rather than per-object attribute walks;
+        # chain.from_iterable flattens the modality lists without a Python
+        # loop around the set builder
+        modality_coverage = set(itertools.chain.from_iterable(self._cap_modalities))
         capability_analysis = {
             "total_capabilities": len(self.registered_capabilities),
-            "capability_types": {},
+            # Counter's C-level counting replaces the get(key, 0) + 1 idiom
+            "capability_types": dict(Counter(self._cap_types)),
             "average_performance": {},
-            "dependency_complexity": 0,
-            "modality_coverage": set()
+            "dependency_complexity": sum(self._cap_dep_counts),
+            "modality_coverage": list(modality_coverage)
         }
         
-        for capability in self.registered_capabilities.values():
-            cap_type = capability.capability_type.value
-            capability_analysis["capability_types"][cap_type] = capability_analysis["capability_types"].get(cap_type, 0) + 1
-            
-            for modality in capability.supported_modalities:
-                capability_analysis["modality_coverage"].add(modality)
-            
-            capability_analysis["dependency_complexity"] += len(capability.dependencies)
-        
-        capability_analysis["modality_coverage"] = list(capability_analysis["modality_coverage"])
-        
         # Analyze collaboration patterns
         collaboration_analysis = {
             "total_sessions": len(self.active_sessions),
@@ -462,16 +619,16 @@ class FutureMCPFramework:
         }
         
         if self.active_sessions:
+            collaboration_analysis["session_types"] = dict(Counter(
+                session.session_type for session in self.active_sessions.values()
+            ))
             effectiveness_scores = []
             emergent_count = 0
-            
+
             for session in self.active_sessions.values():
-                session_type = session["session_type"]
-                collaboration_analysis["session_types"][session_type] = collaboration_analysis["session_types"].get(session_type, 0) + 1
-                
-                if "outcomes" in session:
-                    effectiveness_scores.append(session["outcomes"]["average_effectiveness"])
-                    emergent_count += session["outcomes"]["emergent_behaviors"]
+                if session.outcomes:
+                    effectiveness_scores.append(session.outcomes["average_effectiveness"])
+                    emergent_count += session.outcomes["emergent_behaviors"]
             
             if effectiveness_scores:
                 collaboration_analysis["average_session_effectiveness"] = sum(effectiveness_scores) / len(effectiveness_scores)
@@ -522,26 +679,28 @@ class FutureMCPFramework:
         
         return analysis_results
     
-    def _store_emergent_behavior(self, session_id: str, behavior: Dict[str, Any]):
-        """Store emergent behavior in database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO emergent_behaviors 
-            (session_id, behavior_description, participating_capabilities, emergence_conditions, performance_impact, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            session_id,
-            behavior["description"],
-            json.dumps(behavior["participating_capabilities"]),
-            json.dumps(behavior["emergence_conditions"]),
-            json.dumps(behavior["impact"]),
-            behavior["timestamp"]
-        ))
-        
-        conn.commit()
-        conn.close()
+    async def _store_emergent_behaviors_batch(self, session_id: str,
+                                              behaviors: List[Dict[str, Any]],
+                                              participants_json: Optional[str] = None):
+        """Store a session's emergent behaviors in one transaction.
+
+        Callers that already hold the participant list as JSON can pass it
+        via participants_json to skip re-encoding it per behavior.
+        """
+        if not behaviors:
+            return
+        rows = [
+            (
+                session_id,
+                behavior["description"],
+                participants_json or _dumps(behavior["participating_capabilities"]),
+                _dumps(behavior["emergence_conditions"]),
+                _dumps(behavior["impact"]),
+                behavior["timestamp"]
+            )
+            for behavior in behaviors
+        ]
+        await asyncio.to_thread(self._write_many, SQL_INSERT_EMERGENT, rows)
     
     async def demonstrate_future_scenario(self) -> Dict[str, Any]:
         """Demonstrate a future MCP scenario."""
@@ -600,14 +759,19 @@ class FutureMCPFramework:
 # Example usage
 async def main():
     """Demonstrate the future MCP framework."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     framework = FutureMCPFramework()
-    
+
     print("Future MCP Framework Demonstration")
     print("=" * 50)
-    
-    # Demonstrate future scenario
-    results = await framework.demonstrate_future_scenario()
-    
+
+    try:
+        # Demonstrate future scenario
+        results = await framework.demonstrate_future_scenario()
+    finally:
+        framework.close()
+
     print(f"\nDemonstration completed successfully!")
     print(f"Scenario: {results['scenario']}")
     print(f"Success: {results['demonstration_success']}")